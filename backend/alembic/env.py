@@ -13,6 +13,10 @@ from app.models.task import Task  # noqa
 from app.models.fixed_schedule import FixedSchedule  # noqa
 from app.models.blocked_template import BlockedTemplate  # noqa
 from app.models.user_settings import UserSettings  # noqa
+from app.models.user_revision import UserRevision  # noqa
+from app.models.sync_tombstone import SyncTombstone  # noqa
+from app.models.block_daily_summary import BlockDailySummary  # noqa
+from app.models.schedule_apply_key import ScheduleApplyKey  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,36 @@
+"""add block period gist index
+
+Revision ID: 5d1c7a9e4b20
+Revises: 89f28ff13c6a
+Create Date: 2026-10-19 11:02:17.214530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1c7a9e4b20'
+down_revision: Union[str, Sequence[str], None] = '89f28ff13c6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # uuid 동등 비교를 GiST에 넣으려면 btree_gist가 필요하다.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.create_index(
+        'ix_schedule_blocks_user_period',
+        'schedule_blocks',
+        ['user_id', sa.text("tstzrange(start_at, end_at, '[)')")],
+        unique=False,
+        postgresql_using='gist',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_schedule_blocks_user_period', table_name='schedule_blocks', postgresql_using='gist')
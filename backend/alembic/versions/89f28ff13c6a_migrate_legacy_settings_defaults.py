@@ -0,0 +1,35 @@
+"""migrate legacy settings defaults
+
+Revision ID: 89f28ff13c6a
+Revises: 2832b2199053
+Create Date: 2026-10-19 10:12:41.503921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '89f28ff13c6a'
+down_revision: Union[str, Sequence[str], None] = '2832b2199053'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 예전 기본값(25/5분, 06:00-23:00 그리드)을 현재 기본값으로 한 번만 옮긴다.
+    op.execute("UPDATE user_settings SET focus_duration = 45 WHERE focus_duration = 25")
+    op.execute("UPDATE user_settings SET break_duration = 15 WHERE break_duration = 5")
+    op.execute(
+        "UPDATE user_settings SET grid_start = '00:00', grid_end = '23:59' "
+        "WHERE grid_start = '06:00' AND grid_end = '23:00'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 데이터 마이그레이션이라 되돌릴 값이 없다.
+    pass
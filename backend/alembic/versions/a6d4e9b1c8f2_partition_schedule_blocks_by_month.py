@@ -0,0 +1,246 @@
+"""partition schedule_blocks by month
+
+Revision ID: a6d4e9b1c8f2
+Revises: f3b8d2c7a1e5
+Create Date: 2026-10-19 19:27:05.316042
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d4e9b1c8f2'
+down_revision: Union[str, Sequence[str], None] = 'f3b8d2c7a1e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, user_id, title, note, start_at, end_at, created_at, updated_at, task_id, exclusive, revision"
+MONTHS_AHEAD = 12
+
+
+def _block_columns() -> list:
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('title', sa.String(length=120), nullable=False),
+        sa.Column('note', sa.Text(), nullable=True),
+        sa.Column('start_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('exclusive', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+        sa.Column('revision', sa.BigInteger(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    ]
+
+
+def _create_indexes() -> None:
+    op.create_index('ix_schedule_blocks_user_id', 'schedule_blocks', ['user_id'], unique=False)
+    op.create_index('ix_schedule_blocks_task_id', 'schedule_blocks', ['task_id'], unique=False)
+    op.create_index('ix_schedule_blocks_user_start', 'schedule_blocks', ['user_id', 'start_at'], unique=False)
+    op.create_index('ix_schedule_blocks_user_task', 'schedule_blocks', ['user_id', 'task_id'], unique=False)
+    op.create_index('ix_schedule_blocks_user_revision', 'schedule_blocks', ['user_id', 'revision'], unique=False)
+    op.create_index(
+        'ix_schedule_blocks_user_period',
+        'schedule_blocks',
+        ['user_id', sa.text("tstzrange(start_at, end_at, '[)')")],
+        unique=False,
+        postgresql_using='gist',
+    )
+
+
+def _create_common_triggers() -> None:
+    op.execute(
+        """
+        CREATE TRIGGER trg_schedule_blocks_set_exclusive
+        BEFORE INSERT OR UPDATE OF user_id, start_at, end_at ON schedule_blocks
+        FOR EACH ROW EXECUTE FUNCTION schedule_blocks_set_exclusive()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_schedule_blocks_revision
+        BEFORE INSERT OR UPDATE OF user_id, task_id, title, note, start_at, end_at ON schedule_blocks
+        FOR EACH ROW EXECUTE FUNCTION set_row_revision()
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 테이블은 이름을 바꿔 두고 데이터를 옮긴 뒤 지운다. 인덱스 이름은 새 테이블이 그대로 쓴다.
+    for trigger in ('set_exclusive', 'revision', 'tombstone'):
+        op.execute(f"DROP TRIGGER trg_schedule_blocks_{trigger} ON schedule_blocks")
+    op.execute("ALTER TABLE schedule_blocks DROP CONSTRAINT ex_schedule_blocks_no_overlap")
+    for index in ('user_id', 'task_id', 'user_start', 'user_task', 'user_revision', 'user_period'):
+        op.drop_index(f'ix_schedule_blocks_{index}', table_name='schedule_blocks')
+    op.rename_table('schedule_blocks', 'schedule_blocks_unpartitioned')
+    op.execute("ALTER TABLE schedule_blocks_unpartitioned RENAME CONSTRAINT schedule_blocks_pkey TO schedule_blocks_unpartitioned_pkey")
+
+    # 파티션 키(start_at)가 PK에 들어가야 한다.
+    op.create_table(
+        'schedule_blocks',
+        *_block_columns(),
+        sa.PrimaryKeyConstraint('id', 'start_at'),
+        postgresql_partition_by='RANGE (start_at)',
+    )
+    op.execute("CREATE TABLE schedule_blocks_default PARTITION OF schedule_blocks DEFAULT")
+    _create_indexes()
+
+    # 월 파티션 이름은 schedule_blocks_pYYYYMM, 경계는 UTC 월 초.
+    # 기본 파티션에 이미 그 달 행이 있으면 새 파티션으로 옮긴 뒤 붙인다.
+    op.execute(
+        """
+        CREATE FUNCTION ensure_schedule_block_partitions(first_month date, last_month date) RETURNS integer AS $$
+        DECLARE
+            month date := date_trunc('month', first_month)::date;
+            lower_bound timestamptz;
+            upper_bound timestamptz;
+            part text;
+            created integer := 0;
+        BEGIN
+            -- 여러 워커가 동시에 돌려도 한 번씩만 만든다.
+            PERFORM pg_advisory_xact_lock(hashtext('ensure_schedule_block_partitions'));
+            -- 기본 파티션에서 옮기는 행은 삭제가 아니므로 tombstone을 남기지 않는다.
+            PERFORM set_config('timegrid.partition_maintenance', 'on', true);
+            WHILE month <= last_month LOOP
+                part := 'schedule_blocks_p' || to_char(month, 'YYYYMM');
+                IF to_regclass(part) IS NULL THEN
+                    lower_bound := month::timestamp AT TIME ZONE 'UTC';
+                    upper_bound := (month + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+                    EXECUTE format('CREATE TABLE %I (LIKE schedule_blocks INCLUDING DEFAULTS)', part);
+                    EXECUTE format(
+                        'WITH moved AS (DELETE FROM schedule_blocks_default WHERE start_at >= %L AND start_at < %L RETURNING *) '
+                        'INSERT INTO %I SELECT * FROM moved',
+                        lower_bound, upper_bound, part
+                    );
+                    EXECUTE format(
+                        'ALTER TABLE schedule_blocks ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                        part, lower_bound, upper_bound
+                    );
+                    created := created + 1;
+                END IF;
+                month := (month + interval '1 month')::date;
+            END LOOP;
+            PERFORM set_config('timegrid.partition_maintenance', 'off', true);
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        f"""
+        SELECT ensure_schedule_block_partitions(
+            date_trunc('month', least(
+                coalesce((SELECT min(start_at) FROM schedule_blocks_unpartitioned), now()),
+                now()
+            ) AT TIME ZONE 'UTC')::date,
+            (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{MONTHS_AHEAD} months')::date
+        )
+        """
+    )
+    # 트리거를 만들기 전에 옮겨서 리비전/tombstone이 바뀌지 않게 한다.
+    op.execute(f"INSERT INTO schedule_blocks ({COLUMNS}) SELECT {COLUMNS} FROM schedule_blocks_unpartitioned")
+    op.drop_table('schedule_blocks_unpartitioned')
+
+    _create_common_triggers()
+
+    # start_at이 바뀌어 다른 파티션으로 옮겨지는 UPDATE는 내부적으로 DELETE + INSERT라서
+    # 행이 아직 있으면 tombstone을 남기지 않는다. 파티션 트리거의 TG_TABLE_NAME은 파티션 이름이라 엔티티는 고정한다.
+    op.execute(
+        """
+        CREATE FUNCTION record_block_tombstone() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('timegrid.partition_maintenance', true) = 'on'
+               OR EXISTS (SELECT 1 FROM schedule_blocks WHERE id = OLD.id) THEN
+                RETURN NULL;
+            END IF;
+            INSERT INTO sync_tombstones (user_id, entity, entity_id, revision)
+            VALUES (OLD.user_id, 'schedule_blocks', OLD.id, user_tx_revision(OLD.user_id));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_schedule_blocks_tombstone AFTER DELETE ON schedule_blocks
+        FOR EACH ROW EXECUTE FUNCTION record_block_tombstone()
+        """
+    )
+
+    # 파티션 테이블에는 파티션 키를 = 로 포함하지 않는 exclusion 제약을 걸 수 없다.
+    # 같은 검사를 AFTER 트리거로 하고, 유저 단위 advisory lock으로 동시 쓰기를 직렬화한다.
+    # SQLSTATE는 exclusion_violation(23P01) 그대로라 앱의 409 처리는 바뀌지 않는다.
+    op.execute(
+        """
+        CREATE FUNCTION schedule_blocks_check_overlap() RETURNS trigger AS $$
+        BEGIN
+            IF NOT NEW.exclusive THEN
+                RETURN NULL;
+            END IF;
+            PERFORM pg_advisory_xact_lock(hashtextextended(NEW.user_id::text, 0));
+            IF EXISTS (
+                SELECT 1 FROM schedule_blocks b
+                WHERE b.user_id = NEW.user_id
+                  AND b.exclusive
+                  AND b.id <> NEW.id
+                  AND b.start_at < NEW.end_at
+                  AND tstzrange(b.start_at, b.end_at, '[)') && tstzrange(NEW.start_at, NEW.end_at, '[)')
+            ) THEN
+                RAISE EXCEPTION 'conflicting key value violates exclusion constraint "ex_schedule_blocks_no_overlap"'
+                    USING ERRCODE = 'exclusion_violation';
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_schedule_blocks_no_overlap
+        AFTER INSERT OR UPDATE OF user_id, start_at, end_at, exclusive ON schedule_blocks
+        FOR EACH ROW EXECUTE FUNCTION schedule_blocks_check_overlap()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER trg_schedule_blocks_no_overlap ON schedule_blocks")
+    op.execute("DROP FUNCTION schedule_blocks_check_overlap()")
+    op.execute("DROP TRIGGER trg_schedule_blocks_tombstone ON schedule_blocks")
+    op.execute("DROP FUNCTION record_block_tombstone()")
+    op.execute("DROP TRIGGER trg_schedule_blocks_revision ON schedule_blocks")
+    op.execute("DROP TRIGGER trg_schedule_blocks_set_exclusive ON schedule_blocks")
+    op.rename_table('schedule_blocks', 'schedule_blocks_partitioned')
+    op.execute("ALTER TABLE schedule_blocks_partitioned RENAME CONSTRAINT schedule_blocks_pkey TO schedule_blocks_partitioned_pkey")
+    for index in ('user_id', 'task_id', 'user_start', 'user_task', 'user_revision', 'user_period'):
+        op.drop_index(f'ix_schedule_blocks_{index}', table_name='schedule_blocks_partitioned')
+
+    op.create_table('schedule_blocks', *_block_columns(), sa.PrimaryKeyConstraint('id'))
+    _create_indexes()
+    op.execute(f"INSERT INTO schedule_blocks ({COLUMNS}) SELECT {COLUMNS} FROM schedule_blocks_partitioned")
+    op.drop_table('schedule_blocks_partitioned')
+    op.execute("DROP FUNCTION ensure_schedule_block_partitions(date, date)")
+
+    _create_common_triggers()
+    op.execute(
+        """
+        CREATE TRIGGER trg_schedule_blocks_tombstone AFTER DELETE ON schedule_blocks
+        FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone()
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE schedule_blocks ADD CONSTRAINT ex_schedule_blocks_no_overlap
+        EXCLUDE USING gist (user_id WITH =, tstzrange(start_at, end_at, '[)') WITH &&)
+        WHERE (exclusive)
+        """
+    )
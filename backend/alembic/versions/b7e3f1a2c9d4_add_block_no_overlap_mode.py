@@ -0,0 +1,62 @@
+"""add block no-overlap mode
+
+Revision ID: b7e3f1a2c9d4
+Revises: 5d1c7a9e4b20
+Create Date: 2026-10-19 11:40:03.118274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3f1a2c9d4'
+down_revision: Union[str, Sequence[str], None] = '5d1c7a9e4b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_settings', sa.Column('no_overlap', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    op.add_column('schedule_blocks', sa.Column('exclusive', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+
+    # exclusive는 블록 주인의 no_overlap 설정을 따른다. bulk INSERT/UPDATE 경로도 빠짐없이 덮도록 트리거로 채운다.
+    op.execute(
+        """
+        CREATE FUNCTION schedule_blocks_set_exclusive() RETURNS trigger AS $$
+        BEGIN
+            NEW.exclusive := COALESCE(
+                (SELECT no_overlap FROM user_settings WHERE user_id = NEW.user_id),
+                false
+            );
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_schedule_blocks_set_exclusive
+        BEFORE INSERT OR UPDATE OF user_id, start_at, end_at ON schedule_blocks
+        FOR EACH ROW EXECUTE FUNCTION schedule_blocks_set_exclusive()
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE schedule_blocks ADD CONSTRAINT ex_schedule_blocks_no_overlap
+        EXCLUDE USING gist (user_id WITH =, tstzrange(start_at, end_at, '[)') WITH &&)
+        WHERE (exclusive)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE schedule_blocks DROP CONSTRAINT ex_schedule_blocks_no_overlap")
+    op.execute("DROP TRIGGER trg_schedule_blocks_set_exclusive ON schedule_blocks")
+    op.execute("DROP FUNCTION schedule_blocks_set_exclusive()")
+    op.drop_column('schedule_blocks', 'exclusive')
+    op.drop_column('user_settings', 'no_overlap')
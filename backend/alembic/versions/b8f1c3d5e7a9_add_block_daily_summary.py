@@ -0,0 +1,42 @@
+"""add block daily summary
+
+Revision ID: b8f1c3d5e7a9
+Revises: a6d4e9b1c8f2
+Create Date: 2026-10-19 20:41:07.218843
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8f1c3d5e7a9'
+down_revision: Union[str, Sequence[str], None] = 'a6d4e9b1c8f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'block_daily_summary',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('category', sa.String(length=40), nullable=True),
+        sa.Column('minutes', sa.Integer(), nullable=False),
+        sa.Column('block_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_block_daily_summary_user_day', 'block_daily_summary', ['user_id', 'day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_block_daily_summary_user_day', table_name='block_daily_summary')
+    op.drop_table('block_daily_summary')
@@ -0,0 +1,39 @@
+"""block summary hourly buckets
+
+Revision ID: c2e7a4f9b1d3
+Revises: b8f1c3d5e7a9
+Create Date: 2026-10-19 23:12:44.501327
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e7a4f9b1d3'
+down_revision: Union[str, Sequence[str], None] = 'b8f1c3d5e7a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('block_daily_summary', sa.Column('hour', sa.DateTime(timezone=True), nullable=True))
+    # 이미 날짜로 합쳐진 행은 그 날짜의 UTC 자정으로 옮긴다.
+    op.execute("UPDATE block_daily_summary SET hour = day::timestamp AT TIME ZONE 'UTC'")
+    op.alter_column('block_daily_summary', 'hour', nullable=False)
+    op.drop_index('ix_block_daily_summary_user_day', table_name='block_daily_summary')
+    op.drop_column('block_daily_summary', 'day')
+    op.create_index('ix_block_daily_summary_user_hour', 'block_daily_summary', ['user_id', 'hour'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('block_daily_summary', sa.Column('day', sa.Date(), nullable=True))
+    op.execute("UPDATE block_daily_summary SET day = (hour AT TIME ZONE 'UTC')::date")
+    op.alter_column('block_daily_summary', 'day', nullable=False)
+    op.drop_index('ix_block_daily_summary_user_hour', table_name='block_daily_summary')
+    op.drop_column('block_daily_summary', 'hour')
+    op.create_index('ix_block_daily_summary_user_day', 'block_daily_summary', ['user_id', 'day'], unique=False)
@@ -0,0 +1,28 @@
+"""add tasks created keyset index
+
+Revision ID: c41d8e6f2a73
+Revises: b7e3f1a2c9d4
+Create Date: 2026-10-19 13:05:27.640912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8e6f2a73'
+down_revision: Union[str, Sequence[str], None] = 'b7e3f1a2c9d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_user_created', 'tasks', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user_created', table_name='tasks')
@@ -0,0 +1,106 @@
+"""cap block duration
+
+Revision ID: d4a9c6e2f8b5
+Revises: c2e7a4f9b1d3
+Create Date: 2026-10-19 23:48:19.084613
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a9c6e2f8b5'
+down_revision: Union[str, Sequence[str], None] = 'c2e7a4f9b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app.db.blocks.BLOCK_MAX_DURATION과 같아야 한다.
+MAX_DURATION = "31 days"
+
+OVERLAP_FUNCTION = """
+    CREATE OR REPLACE FUNCTION schedule_blocks_check_overlap() RETURNS trigger AS $$
+    BEGIN
+        IF NOT NEW.exclusive THEN
+            RETURN NULL;
+        END IF;
+        PERFORM pg_advisory_xact_lock(hashtextextended(NEW.user_id::text, 0));
+        IF EXISTS (
+            SELECT 1 FROM schedule_blocks b
+            WHERE b.user_id = NEW.user_id
+              AND b.exclusive
+              AND b.id <> NEW.id
+              AND b.start_at < NEW.end_at
+              {lower_bound}
+              AND tstzrange(b.start_at, b.end_at, '[)') && tstzrange(NEW.start_at, NEW.end_at, '[)')
+        ) THEN
+            RAISE EXCEPTION 'conflicting key value violates exclusion constraint "ex_schedule_blocks_no_overlap"'
+                USING ERRCODE = 'exclusion_violation';
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+ENSURE_PARTITIONS_FUNCTION = """
+    CREATE OR REPLACE FUNCTION ensure_schedule_block_partitions(first_month date, last_month date) RETURNS integer AS $$
+    DECLARE
+        month date := date_trunc('month', first_month)::date;
+        lower_bound timestamptz;
+        upper_bound timestamptz;
+        part text;
+        created integer := 0;
+    BEGIN
+        -- 여러 워커가 동시에 돌려도 한 번씩만 만든다.
+        PERFORM pg_advisory_xact_lock(hashtext('ensure_schedule_block_partitions'));
+        -- 기본 파티션에서 옮기는 행은 삭제가 아니므로 tombstone을 남기지 않는다.
+        PERFORM set_config('timegrid.partition_maintenance', 'on', true);
+        WHILE month <= last_month LOOP
+            part := 'schedule_blocks_p' || to_char(month, 'YYYYMM');
+            IF to_regclass(part) IS NULL THEN
+                lower_bound := month::timestamp AT TIME ZONE 'UTC';
+                upper_bound := (month + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+                EXECUTE format('CREATE TABLE %I (LIKE schedule_blocks INCLUDING DEFAULTS{including})', part);
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM schedule_blocks_default WHERE start_at >= %L AND start_at < %L RETURNING *) '
+                    'INSERT INTO %I SELECT * FROM moved',
+                    lower_bound, upper_bound, part
+                );
+                EXECUTE format(
+                    'ALTER TABLE schedule_blocks ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                    part, lower_bound, upper_bound
+                );
+                created := created + 1;
+            END IF;
+            month := (month + interval '1 month')::date;
+        END LOOP;
+        PERFORM set_config('timegrid.partition_maintenance', 'off', true);
+        RETURN created;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 이미 있는 긴 블록은 최대 길이로 자른다.
+    op.execute(
+        f"UPDATE schedule_blocks SET end_at = start_at + interval '{MAX_DURATION}' "
+        f"WHERE end_at - start_at > interval '{MAX_DURATION}'"
+    )
+    op.execute(
+        "ALTER TABLE schedule_blocks ADD CONSTRAINT ck_schedule_blocks_max_duration "
+        f"CHECK (end_at - start_at <= interval '{MAX_DURATION}')"
+    )
+    # 새 파티션도 CHECK를 갖고 만들어야 ATTACH할 수 있다.
+    op.execute(ENSURE_PARTITIONS_FUNCTION.format(including=" INCLUDING CONSTRAINTS"))
+    # 길이 상한 덕분에 이전 달 파티션을 건너뛸 수 있다.
+    op.execute(OVERLAP_FUNCTION.format(lower_bound=f"AND b.start_at > NEW.start_at - interval '{MAX_DURATION}'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(OVERLAP_FUNCTION.format(lower_bound=""))
+    op.execute(ENSURE_PARTITIONS_FUNCTION.format(including=""))
+    op.execute("ALTER TABLE schedule_blocks DROP CONSTRAINT ck_schedule_blocks_max_duration")
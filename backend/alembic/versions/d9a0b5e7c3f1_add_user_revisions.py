@@ -0,0 +1,81 @@
+"""add user revisions
+
+Revision ID: d9a0b5e7c3f1
+Revises: c41d8e6f2a73
+Create Date: 2026-10-19 15:22:48.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a0b5e7c3f1'
+down_revision: Union[str, Sequence[str], None] = 'c41d8e6f2a73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = ('schedule_blocks', 'tasks', 'fixed_schedules', 'blocked_templates')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user_revisions',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('revision', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    # 문장 단위 트리거: bulk INSERT/UPDATE/DELETE도 유저당 한 번만 올린다.
+    op.execute(
+        """
+        CREATE FUNCTION bump_user_revision() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO user_revisions (user_id, revision)
+                SELECT DISTINCT user_id, 1 FROM old_rows
+                ON CONFLICT (user_id) DO UPDATE SET revision = user_revisions.revision + 1;
+            ELSE
+                INSERT INTO user_revisions (user_id, revision)
+                SELECT DISTINCT user_id, 1 FROM new_rows
+                ON CONFLICT (user_id) DO UPDATE SET revision = user_revisions.revision + 1;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TRACKED_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_revision_ins AFTER INSERT ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_user_revision()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_revision_upd AFTER UPDATE ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_user_revision()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_revision_del AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_user_revision()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TRACKED_TABLES:
+        for suffix in ('ins', 'upd', 'del'):
+            op.execute(f"DROP TRIGGER trg_{table}_revision_{suffix} ON {table}")
+    op.execute("DROP FUNCTION bump_user_revision()")
+    op.drop_table('user_revisions')
@@ -0,0 +1,169 @@
+"""add sync revisions and tombstones
+
+Revision ID: e2c6f9a41b58
+Revises: d9a0b5e7c3f1
+Create Date: 2026-10-19 17:08:12.331907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c6f9a41b58'
+down_revision: Union[str, Sequence[str], None] = 'd9a0b5e7c3f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = ('schedule_blocks', 'tasks', 'fixed_schedules', 'blocked_templates')
+
+# schedule_blocks.exclusive만 바꾸는 UPDATE(no-overlap 토글)는 클라이언트가 볼 변경이 아니라서 리비전을 올리지 않는다.
+REVISION_UPDATE_COLUMNS = {
+    'schedule_blocks': 'UPDATE OF user_id, task_id, title, note, start_at, end_at',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 문장 단위 리비전 트리거(d9a0b5e7c3f1)를 행 단위 트리거로 바꾼다.
+    for table in TRACKED_TABLES:
+        for suffix in ('ins', 'upd', 'del'):
+            op.execute(f"DROP TRIGGER trg_{table}_revision_{suffix} ON {table}")
+    op.execute("DROP FUNCTION bump_user_revision()")
+
+    op.add_column('user_revisions', sa.Column('sync_floor', sa.BigInteger(), server_default='0', nullable=False))
+    for table in TRACKED_TABLES:
+        op.add_column(table, sa.Column('revision', sa.BigInteger(), server_default='0', nullable=False))
+        op.create_index(f'ix_{table}_user_revision', table, ['user_id', 'revision'], unique=False)
+
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('entity', sa.String(length=40), nullable=False),
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('revision', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_sync_tombstones_user_revision', 'sync_tombstones', ['user_id', 'revision'], unique=False)
+    op.create_index('ix_sync_tombstones_deleted_at', 'sync_tombstones', ['deleted_at'], unique=False)
+
+    # 한 트랜잭션 안의 변경은 같은 리비전을 쓴다. 올린 값은 트랜잭션 로컬 설정에 기억해 둔다.
+    # user_revisions 행 잠금이 커밋까지 유지되므로, 커밋된 리비전 N이 보이면 N 이하도 모두 커밋된 것이다.
+    op.execute(
+        """
+        CREATE FUNCTION user_tx_revision(uid uuid) RETURNS bigint AS $$
+        DECLARE
+            cached text := current_setting('timegrid.tx_revision', true);
+            rev bigint;
+        BEGIN
+            IF cached IS NOT NULL AND split_part(cached, ':', 1) = uid::text THEN
+                RETURN split_part(cached, ':', 2)::bigint;
+            END IF;
+            INSERT INTO user_revisions (user_id, revision) VALUES (uid, 1)
+            ON CONFLICT (user_id) DO UPDATE SET revision = user_revisions.revision + 1
+            RETURNING revision INTO rev;
+            PERFORM set_config('timegrid.tx_revision', uid::text || ':' || rev::text, true);
+            RETURN rev;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION set_row_revision() RETURNS trigger AS $$
+        BEGIN
+            NEW.revision := user_tx_revision(NEW.user_id);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO sync_tombstones (user_id, entity, entity_id, revision)
+            VALUES (OLD.user_id, TG_TABLE_NAME, OLD.id, user_tx_revision(OLD.user_id));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TRACKED_TABLES:
+        update_event = REVISION_UPDATE_COLUMNS.get(table, 'UPDATE')
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_revision BEFORE INSERT OR {update_event} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION set_row_revision()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_tombstone AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TRACKED_TABLES:
+        op.execute(f"DROP TRIGGER trg_{table}_tombstone ON {table}")
+        op.execute(f"DROP TRIGGER trg_{table}_revision ON {table}")
+    op.execute("DROP FUNCTION record_sync_tombstone()")
+    op.execute("DROP FUNCTION set_row_revision()")
+    op.execute("DROP FUNCTION user_tx_revision(uuid)")
+
+    op.drop_index('ix_sync_tombstones_deleted_at', table_name='sync_tombstones')
+    op.drop_index('ix_sync_tombstones_user_revision', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    for table in TRACKED_TABLES:
+        op.drop_index(f'ix_{table}_user_revision', table_name=table)
+        op.drop_column(table, 'revision')
+    op.drop_column('user_revisions', 'sync_floor')
+
+    op.execute(
+        """
+        CREATE FUNCTION bump_user_revision() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO user_revisions (user_id, revision)
+                SELECT DISTINCT user_id, 1 FROM old_rows
+                ON CONFLICT (user_id) DO UPDATE SET revision = user_revisions.revision + 1;
+            ELSE
+                INSERT INTO user_revisions (user_id, revision)
+                SELECT DISTINCT user_id, 1 FROM new_rows
+                ON CONFLICT (user_id) DO UPDATE SET revision = user_revisions.revision + 1;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TRACKED_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_revision_ins AFTER INSERT ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_user_revision()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_revision_upd AFTER UPDATE ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_user_revision()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_revision_del AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_user_revision()
+            """
+        )
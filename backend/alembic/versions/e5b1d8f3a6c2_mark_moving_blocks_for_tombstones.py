@@ -0,0 +1,119 @@
+"""mark moving blocks for tombstones
+
+Revision ID: e5b1d8f3a6c2
+Revises: d4a9c6e2f8b5
+Create Date: 2026-10-20 00:21:36.772190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b1d8f3a6c2'
+down_revision: Union[str, Sequence[str], None] = 'd4a9c6e2f8b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # start_at이 바뀌는 UPDATE는 트랜잭션 설정 timegrid.moving_blocks에 id를 적어 둔다.
+    # 다른 파티션으로 옮겨지면 AFTER DELETE(tombstone 트리거)가, 같은 파티션에 남으면 AFTER UPDATE가 지운다.
+    # 예전처럼 EXISTS (... WHERE id = OLD.id)로 모든 파티션을 뒤지지 않는다.
+    op.execute(
+        """
+        CREATE FUNCTION mark_moving_block() RETURNS trigger AS $$
+        BEGIN
+            PERFORM set_config(
+                'timegrid.moving_blocks',
+                coalesce(current_setting('timegrid.moving_blocks', true), '') || OLD.id::text || ',',
+                true
+            );
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION take_moving_block(block_id uuid) RETURNS boolean AS $$
+        DECLARE
+            moving text := coalesce(current_setting('timegrid.moving_blocks', true), '');
+            mark text := block_id::text || ',';
+        BEGIN
+            IF position(mark IN moving) = 0 THEN
+                RETURN false;
+            END IF;
+            PERFORM set_config('timegrid.moving_blocks', replace(moving, mark, ''), true);
+            RETURN true;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION clear_moving_block() RETURNS trigger AS $$
+        BEGIN
+            PERFORM take_moving_block(OLD.id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_block_tombstone() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('timegrid.partition_maintenance', true) = 'on'
+               OR take_moving_block(OLD.id) THEN
+                RETURN NULL;
+            END IF;
+            INSERT INTO sync_tombstones (user_id, entity, entity_id, revision)
+            VALUES (OLD.user_id, 'schedule_blocks', OLD.id, user_tx_revision(OLD.user_id));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_schedule_blocks_mark_moving
+        BEFORE UPDATE OF start_at ON schedule_blocks
+        FOR EACH ROW WHEN (OLD.start_at IS DISTINCT FROM NEW.start_at)
+        EXECUTE FUNCTION mark_moving_block()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_schedule_blocks_clear_moving
+        AFTER UPDATE OF start_at ON schedule_blocks
+        FOR EACH ROW WHEN (OLD.start_at IS DISTINCT FROM NEW.start_at)
+        EXECUTE FUNCTION clear_moving_block()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER trg_schedule_blocks_clear_moving ON schedule_blocks")
+    op.execute("DROP TRIGGER trg_schedule_blocks_mark_moving ON schedule_blocks")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_block_tombstone() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('timegrid.partition_maintenance', true) = 'on'
+               OR EXISTS (SELECT 1 FROM schedule_blocks WHERE id = OLD.id) THEN
+                RETURN NULL;
+            END IF;
+            INSERT INTO sync_tombstones (user_id, entity, entity_id, revision)
+            VALUES (OLD.user_id, 'schedule_blocks', OLD.id, user_tx_revision(OLD.user_id));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP FUNCTION clear_moving_block()")
+    op.execute("DROP FUNCTION take_moving_block(uuid)")
+    op.execute("DROP FUNCTION mark_moving_block()")
@@ -0,0 +1,62 @@
+"""add recurring minute columns
+
+Revision ID: f3b8d2c7a1e5
+Revises: e2c6f9a41b58
+Create Date: 2026-10-19 18:12:44.507318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2c7a1e5'
+down_revision: Union[str, Sequence[str], None] = 'e2c6f9a41b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('fixed_schedules', 'blocked_templates')
+
+
+def _minutes_sql(column: str) -> str:
+    # app.services.recurrence.parse_minutes와 같은 규칙. 잘못된 값은 0.
+    return f"""
+        CASE WHEN {column} ~ '^[0-9]{{1,2}}:[0-5][0-9]$'
+              AND split_part({column}, ':', 1)::int <= 24
+        THEN least(split_part({column}, ':', 1)::int * 60 + split_part({column}, ':', 2)::int, 1440)
+        ELSE 0 END
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('days_mask', sa.SmallInteger(), server_default='0', nullable=False))
+        op.add_column(table, sa.Column('start_min', sa.Integer(), server_default='0', nullable=False))
+        op.add_column(table, sa.Column('end_min', sa.Integer(), server_default='0', nullable=False))
+
+        # 파생 컬럼만 채우는 것이라 sync 리비전은 올리지 않는다.
+        op.execute(f"ALTER TABLE {table} DISABLE TRIGGER trg_{table}_revision")
+        op.execute(
+            f"""
+            UPDATE {table} SET
+                days_mask = coalesce((
+                    SELECT bit_or(1 << d::int)
+                    FROM json_array_elements_text(days) AS d
+                    WHERE d ~ '^[0-6]$'
+                ), 0),
+                start_min = {_minutes_sql('start_time')},
+                end_min = {_minutes_sql('end_time')}
+            """
+        )
+        op.execute(f"ALTER TABLE {table} ENABLE TRIGGER trg_{table}_revision")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_column(table, 'end_min')
+        op.drop_column(table, 'start_min')
+        op.drop_column(table, 'days_mask')
@@ -1,40 +1,93 @@
+import asyncio
 import json
 import re
 import uuid
 import math
+import hashlib
+import hmac
+import time
 from datetime import datetime, timezone, timedelta, date
+from typing import Literal
 
 import requests
-from fastapi import APIRouter, Depends, HTTPException, Response, Cookie
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Response, Cookie, Header, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import bindparam, delete, select, text, tuple_, update
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from google.oauth2 import id_token as google_id_token
-from google.auth.transport import requests as google_requests
-
+from app.core.cache import AsyncSingleFlight, SingleFlight, TTLCache
 from app.core.config import settings
-from app.core.security import create_access_token, decode_access_token, COOKIE_NAME
-from app.db.session import get_db
+from app.core.events import change_hub
+from app.core.google_auth import google_certs
+from app.core.responses import FastJSONResponse, model_response
+from app.core.security import AuthUser, create_access_token, decode_access_token, COOKIE_NAME
+from app.db.blocks import (
+    BLOCK_MAX_DURATION,
+    BLOCK_OUT_COLUMNS,
+    block_insert_params,
+    insert_blocks,
+    insert_blocks_stmt,
+    is_overlap_violation,
+    overdue_tasks_stmt,
+    overlaps_range,
+    serialize_block_values,
+)
+from app.db.calendar import WEEK_BUNDLE_NO_SETTINGS_SQL, WEEK_BUNDLE_SQL
+from app.db.idempotency import claim_apply_key, store_apply_response
+from app.db.keyset import decode_cursor, encode_cursor
+from app.db.pipeline import fetch_pipelined
+from app.db.reads import (
+    BLOCKED_TEMPLATE_OUT_COLUMNS,
+    FIXED_SCHEDULE_OUT_COLUMNS,
+    TASK_OUT_COLUMNS,
+    rows_json,
+    stream_ndjson,
+)
+from app.db.revisions import CONDITIONAL_CACHE_CONTROL, etag_matches, make_etag, user_revision_stmt
+from app.db.session import async_engine, get_async_db, get_db, pool_stats
+from app.db.summaries import compacted_before, daily_totals_stmt, summary_exists_stmt
+from app.db.sync import ENTITY_KEYS, SYNC_ENTITIES
 from app.models.user import User
 from app.models.schedule_block import ScheduleBlock
 from app.models.task import Task
 from app.models.fixed_schedule import FixedSchedule
 from app.models.blocked_template import BlockedTemplate
 from app.models.user_settings import UserSettings
+from app.models.user_revision import UserRevision
+from app.models.sync_tombstone import SyncTombstone
+from app.services.recurrence import recurrence, recurring_columns, runs_on_weekday, weekly_ranges
+from app.services.reports import reports, summarize_rows
 from app.schemas.ai import (
     ChatRequest,
     ChatResponse,
     ScheduleRequest,
     ScheduleResponse,
+    ScheduleApplyRequest,
+    ScheduleApplyResponse,
     RescheduleRequest,
     RescheduleResponse,
 )
-from app.schemas.schedule_block import BlockCreate, BlockUpdate, BlockOut
+from app.schemas.schedule_block import (
+    BlockCreate,
+    BlockUpdate,
+    BlockOut,
+    BlockBatchOp,
+    BlockBatchRequest,
+    BlockBatchResponse,
+    BlockDailyOut,
+)
 from app.schemas.task import TaskCreate, TaskUpdate, TaskOut
 from app.schemas.fixed_schedule import FixedScheduleCreate, FixedScheduleUpdate, FixedScheduleOut
 from app.schemas.blocked_template import BlockedTemplateCreate, BlockedTemplateUpdate, BlockedTemplateOut
+from app.schemas.calendar import CalendarWeekOut
 from app.schemas.settings import SettingsOut, SettingsUpdate
-router = APIRouter()
+from app.schemas.report import ReportSummaryOut
+from app.schemas.sync import SyncOut
+router = APIRouter(default_response_class=FastJSONResponse)
 
 DEFAULT_SETTINGS = {
     "week_start_day": "sunday",
@@ -44,6 +97,7 @@ DEFAULT_SETTINGS = {
     "scheduling_density": 60,
     "preferred_time": "any",
     "auto_schedule": True,
+    "no_overlap": False,
     "focus_duration": 45,
     "break_duration": 15,
     "timer_sound": True,
@@ -74,6 +128,21 @@ IMPORTANCE_TO_PRIORITY = {
 VALID_PREFERRED = {"morning", "afternoon", "evening", "any"}
 VALID_FOCUS = {"high", "medium", "low"}
 
+# 같은 태스크/주간으로 연달아 들어오는 /ai/schedule 요청은 한 번만 계산한다.
+schedule_flight = SingleFlight()
+schedule_cache = TTLCache(ttl=settings.AI_SCHEDULE_CACHE_TTL_SECONDS, maxsize=512)
+
+# 유저별 설정(serialize_settings 결과). PATCH /settings가 갱신한다.
+settings_cache = TTLCache(ttl=settings.SETTINGS_CACHE_TTL_SECONDS, maxsize=4096)
+
+# (user_id, Idempotency-Key) -> (payload hash, 응답). 같은 키로 재시도하면 저장된 응답을 돌려준다.
+# 프로세스 안의 빠른 경로일 뿐이고, 한 번만 적용되는 건 schedule_apply_keys 행이 보장한다.
+apply_cache = TTLCache(ttl=settings.IDEMPOTENCY_TTL_SECONDS, maxsize=4096)
+apply_flight = AsyncSingleFlight()
+
+# 토큰 sub -> AuthUser. 로그인(upsert) 때 갱신한다.
+user_cache = TTLCache(ttl=settings.USER_CACHE_TTL_SECONDS, maxsize=settings.USER_CACHE_MAX_ENTRIES)
+
 
 def clamp_minutes(value: int, min_value: int = 15, max_value: int = 600) -> int:
     return max(min_value, min(max_value, value))
@@ -206,10 +275,6 @@ def normalize_grid_bounds(start_str: str, end_str: str) -> tuple[int, int]:
     return start_min, end_min
 
 
-def day_index_sun0(target_date: date) -> int:
-    return (target_date.weekday() + 1) % 7
-
-
 def iter_dates(start_date: date, end_date: date) -> list[date]:
     if end_date < start_date:
         return []
@@ -228,8 +293,7 @@ def build_daily_occupied(
     now_local: datetime,
     local_tz: timezone,
     existing_blocks: list[ScheduleBlock],
-    fixed_schedules: list[FixedSchedule],
-    blocked_templates: list[BlockedTemplate],
+    recurring: list[dict],
 ) -> list[bool]:
     slots_per_day = max(1, int(math.ceil((end_min - start_min) / SLOT_MINUTES)))
     occupied = [False] * slots_per_day
@@ -242,26 +306,16 @@ def build_daily_occupied(
         for i in range(start_slot, end_slot):
             occupied[i] = True
 
-    day_idx = day_index_sun0(day_date)
-
-    for item in fixed_schedules:
-        if day_idx in item.days:
-            sh, sm = [int(x) for x in item.start_time.split(":")]
-            eh, em = [int(x) for x in item.end_time.split(":")]
-            mark_range(sh * 60 + sm, eh * 60 + em)
-
-    for item in blocked_templates:
-        if day_idx in item.days:
-            sh, sm = [int(x) for x in item.start_time.split(":")]
-            eh, em = [int(x) for x in item.end_time.split(":")]
-            mark_range(sh * 60 + sm, eh * 60 + em)
-
     day_start_local = datetime(day_date.year, day_date.month, day_date.day, tzinfo=local_tz)
     day_end_local = day_start_local + timedelta(days=1)
 
-    for block in existing_blocks:
-        start_local = block.start_at.astimezone(local_tz)
-        end_local = block.end_at.astimezone(local_tz)
+    # recurring: 고정 일정/차단 템플릿을 recurrence 서비스로 펼친 실제 구간
+    spans = [(block.start_at, block.end_at) for block in existing_blocks]
+    spans.extend((occ["start_at"], occ["end_at"]) for occ in recurring)
+
+    for span_start, span_end in spans:
+        start_local = span_start.astimezone(local_tz)
+        end_local = span_end.astimezone(local_tz)
         if end_local <= day_start_local or start_local >= day_end_local:
             continue
         overlap_start = max(start_local, day_start_local)
@@ -290,8 +344,7 @@ def plan_study_blocks(
     now_local: datetime,
     local_tz: timezone,
     existing_blocks: list[ScheduleBlock],
-    fixed_schedules: list[FixedSchedule],
-    blocked_templates: list[BlockedTemplate],
+    recurring: list[dict],
 ) -> list[dict]:
     dates = iter_dates(start_date, end_date)
     if not dates:
@@ -316,8 +369,7 @@ def plan_study_blocks(
             now_local,
             local_tz,
             existing_blocks,
-            fixed_schedules,
-            blocked_templates,
+            recurring,
         )
         free_slots = sum(1 for slot in occupied if not slot)
         day_infos.append(
@@ -448,19 +500,9 @@ def rule_based_schedule(request: ScheduleRequest) -> tuple[list[dict], list[dict
         day_index = day_index_from_date(start, request.week_start)
         mark_range(occupied, slots_per_day, request.start_hour, day_index, minutes_from_start(start), minutes_from_start(end))
 
-    # fixed schedules
-    for item in request.fixed_schedules:
-        for day_index in item.days:
-            sh, sm = [int(x) for x in item.start.split(":")]
-            eh, em = [int(x) for x in item.end.split(":")]
-            mark_range(occupied, slots_per_day, request.start_hour, day_index, sh * 60 + sm, eh * 60 + em)
-
-    # blocked templates
-    for item in request.blocked_templates:
-        for day_index in item.days:
-            sh, sm = [int(x) for x in item.start.split(":")]
-            eh, em = [int(x) for x in item.end.split(":")]
-            mark_range(occupied, slots_per_day, request.start_hour, day_index, sh * 60 + sm, eh * 60 + em)
+    # fixed schedules / blocked templates
+    for day_index, range_start, range_end in weekly_ranges([*request.fixed_schedules, *request.blocked_templates]):
+        mark_range(occupied, slots_per_day, request.start_hour, day_index, range_start, range_end)
 
     # manual blocked ranges
     for item in request.blocked_ranges:
@@ -565,6 +607,25 @@ def rule_based_schedule(request: ScheduleRequest) -> tuple[list[dict], list[dict
     return proposed, unscheduled
 
 
+def normalize_schedule_request(request: ScheduleRequest) -> ScheduleRequest:
+    # 스케줄러는 분 단위까지만 보므로 now를 분으로 내리고, 순서에 의미 없는 목록은 정렬한다.
+    now = request.now or datetime.now(timezone.utc)
+    return request.model_copy(
+        update={
+            "now": now.replace(second=0, microsecond=0),
+            "tasks": sorted(request.tasks, key=lambda t: t.id),
+            "existing_blocks": sorted(request.existing_blocks, key=lambda b: (b.start_at.isoformat(), b.end_at.isoformat())),
+            "fixed_schedules": sorted(request.fixed_schedules, key=lambda f: (f.start, f.end, f.days)),
+            "blocked_templates": sorted(request.blocked_templates, key=lambda t: (t.start, t.end, t.days)),
+            "blocked_ranges": sorted(request.blocked_ranges, key=lambda r: (r.date.isoformat(), r.start_min, r.end_min)),
+        }
+    )
+
+
+def schedule_request_hash(request: ScheduleRequest) -> str:
+    return hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+
+
 def gemini_schedule(request: ScheduleRequest) -> tuple[list[dict], list[dict]] | None:
     if not settings.GEMINI_API_KEY:
         return None
@@ -577,17 +638,8 @@ def gemini_schedule(request: ScheduleRequest) -> tuple[list[dict], list[dict]] |
         day_index = day_index_from_date(start, request.week_start)
         mark_range(occupied, slots_per_day, request.start_hour, day_index, minutes_from_start(start), minutes_from_start(end))
 
-    for item in request.fixed_schedules:
-        for day_index in item.days:
-            sh, sm = [int(x) for x in item.start.split(":")]
-            eh, em = [int(x) for x in item.end.split(":")]
-            mark_range(occupied, slots_per_day, request.start_hour, day_index, sh * 60 + sm, eh * 60 + em)
-
-    for item in request.blocked_templates:
-        for day_index in item.days:
-            sh, sm = [int(x) for x in item.start.split(":")]
-            eh, em = [int(x) for x in item.end.split(":")]
-            mark_range(occupied, slots_per_day, request.start_hour, day_index, sh * 60 + sm, eh * 60 + em)
+    for day_index, range_start, range_end in weekly_ranges([*request.fixed_schedules, *request.blocked_templates]):
+        mark_range(occupied, slots_per_day, request.start_hour, day_index, range_start, range_end)
 
     for item in request.blocked_ranges:
         day_index = day_index_from_date(item.date, request.week_start)
@@ -744,6 +796,7 @@ def serialize_settings(row: UserSettings) -> dict:
         "scheduling_density": row.scheduling_density,
         "preferred_time": row.preferred_time,
         "auto_schedule": row.auto_schedule,
+        "no_overlap": row.no_overlap,
         "focus_duration": row.focus_duration,
         "break_duration": row.break_duration,
         "timer_sound": row.timer_sound,
@@ -755,19 +808,11 @@ def serialize_settings(row: UserSettings) -> dict:
     }
 
 
-def get_or_create_settings(db: Session, user: User) -> UserSettings:
+def get_or_create_settings(db: Session, user: AuthUser) -> UserSettings:
+    # 예전 기본값 보정은 alembic 89f28ff13c6a에서 한 번만 처리한다. 여기서는 읽기만 한다.
     stmt = select(UserSettings).where(UserSettings.user_id == user.id)
     row = db.execute(stmt).scalar_one_or_none()
     if row:
-        if row.focus_duration == 25:
-            row.focus_duration = DEFAULT_SETTINGS["focus_duration"]
-        if row.break_duration == 5:
-            row.break_duration = DEFAULT_SETTINGS["break_duration"]
-        if row.grid_start == "06:00" and row.grid_end == "23:00":
-            row.grid_start = DEFAULT_SETTINGS["grid_start"]
-            row.grid_end = DEFAULT_SETTINGS["grid_end"]
-        db.commit()
-        db.refresh(row)
         return row
     row = UserSettings(user_id=user.id, **DEFAULT_SETTINGS)
     db.add(row)
@@ -776,6 +821,16 @@ def get_or_create_settings(db: Session, user: User) -> UserSettings:
     return row
 
 
+def load_settings(db: Session, user: AuthUser) -> dict:
+    cached = settings_cache.get(user.id)
+    if cached is not None:
+        return cached
+    generation = settings_cache.generation(user.id)
+    data = serialize_settings(get_or_create_settings(db, user))
+    settings_cache.set(user.id, data, generation)
+    return data
+
+
 def serialize_task(row: Task) -> dict:
     return {
         "id": str(row.id),
@@ -795,6 +850,34 @@ def serialize_task(row: Task) -> dict:
     }
 
 
+def parse_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+def conditional_headers(user: AuthUser, revision: int | None) -> dict:
+    return {"ETag": make_etag(user.id, revision), "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+
+
+def not_modified(headers: dict, if_none_match: str | None) -> Response | None:
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+# 커밋 직후에 부른다. 구독자가 있을 때만 리비전을 읽어서 이벤트에 싣는다.
+async def publish_changes(db: AsyncSession, user_id: uuid.UUID, *entities: str) -> None:
+    if change_hub.has_subscribers(user_id):
+        change_hub.publish(user_id, await db.scalar(user_revision_stmt(user_id)) or 0, *entities)
+
+
+def publish_changes_sync(db: Session, user_id: uuid.UUID, *entities: str) -> None:
+    if change_hub.has_subscribers(user_id):
+        change_hub.publish(user_id, db.scalar(user_revision_stmt(user_id)) or 0, *entities)
+
+
 def serialize_fixed_schedule(row: FixedSchedule) -> dict:
     return {
         "id": str(row.id),
@@ -820,6 +903,38 @@ def serialize_blocked_template(row: BlockedTemplate) -> dict:
 def health():
     return {"ok": True}
 
+
+@router.get("/ready")
+async def ready(response: Response):
+    started = time.perf_counter()
+
+    async def ping() -> None:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    try:
+        # 풀 대기/접속/쿼리 전체에 타임아웃을 건다.
+        await asyncio.wait_for(ping(), timeout=settings.DB_READY_TIMEOUT_SECONDS)
+    except Exception as exc:
+        response.status_code = 503
+        return {"ok": False, "db": {"ok": False, "error": exc.__class__.__name__}}
+    latency_ms = round((time.perf_counter() - started) * 1000, 2)
+    return {"ok": True, "db": {"ok": True, "latency_ms": latency_ms}}
+
+
+def require_metrics_token(authorization: str | None = Header(None)) -> None:
+    # 풀 내부 상태는 운영용이라 유저 세션이 아니라 별도 토큰으로만 연다.
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="invalid metrics token")
+
+
+@router.get("/metrics/db", dependencies=[Depends(require_metrics_token)])
+def db_metrics():
+    return {"pools": pool_stats()}
+
 @router.post("/auth/google")
 def auth_google(payload: dict, response: Response, db: Session = Depends(get_db)):
     token = payload.get("id_token")
@@ -827,12 +942,8 @@ def auth_google(payload: dict, response: Response, db: Session = Depends(get_db)
         raise HTTPException(status_code=400, detail="id_token is required")
 
     try:
-        # 공식 가이드: verify_oauth2_token(token, Request(), WEB_CLIENT_ID) :contentReference[oaicite:5]{index=5}
-        idinfo = google_id_token.verify_oauth2_token(
-            token,
-            google_requests.Request(),
-            settings.GOOGLE_CLIENT_ID,
-        )
+        # verify_oauth2_token과 같은 검증(서명/aud/exp/iss)을 캐시된 인증서로 한다.
+        idinfo = google_certs.verify(token, settings.GOOGLE_CLIENT_ID)
     except Exception:
         raise HTTPException(status_code=401, detail="invalid google id_token")
 
@@ -864,7 +975,14 @@ def auth_google(payload: dict, response: Response, db: Session = Depends(get_db)
         user.last_login_at = now
         db.commit()
 
-    access = create_access_token(str(user.id), settings.JWT_SECRET)
+    auth_user = AuthUser(id=user.id, email=user.email, name=user.name, picture=user.picture)
+    user_cache.set(str(user.id), auth_user)
+
+    access = create_access_token(
+        str(user.id),
+        settings.JWT_SECRET,
+        claims={"email": user.email, "name": user.name, "picture": user.picture},
+    )
 
     # 쿠키 세션: FastAPI Response.set_cookie로 설정 가능 :contentReference[oaicite:6]{index=6}
     response.set_cookie(
@@ -886,8 +1004,8 @@ def auth_google(payload: dict, response: Response, db: Session = Depends(get_db)
         }
     }
 
-def get_current_user(
-    db: Session = Depends(get_db),
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
     token: str | None = Cookie(default=None, alias=COOKIE_NAME),
 ):
     if not token:
@@ -896,63 +1014,117 @@ def get_current_user(
     try:
         payload = decode_access_token(token, settings.JWT_SECRET)
         user_id = payload.get("sub")
-        uuid.UUID(user_id)  # 형식 검증
+        user_uuid = uuid.UUID(user_id)  # 형식 검증
     except Exception:
         raise HTTPException(status_code=401, detail="invalid session")
 
-    user = db.get(User, user_id)
+    # 서명된 claim을 믿는 모드에서는 users 테이블을 보지 않는다.
+    if settings.AUTH_TRUST_JWT_CLAIMS:
+        return AuthUser(
+            id=user_uuid,
+            email=payload.get("email"),
+            name=payload.get("name"),
+            picture=payload.get("picture"),
+        )
+
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    user = await db.get(User, user_uuid)
     if not user:
         raise HTTPException(status_code=401, detail="user not found")
-    return user
+    auth_user = AuthUser(id=user.id, email=user.email, name=user.name, picture=user.picture)
+    user_cache.set(user_id, auth_user)
+    return auth_user
 
 @router.get("/me")
-def me(user: User = Depends(get_current_user)):
+async def me(user: AuthUser = Depends(get_current_user)):
     return {"id": str(user.id), "email": user.email, "name": user.name, "picture": user.picture}
 
 
 @router.get("/settings", response_model=SettingsOut)
-def get_settings(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+async def get_settings(
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
 ):
-    row = get_or_create_settings(db, user)
-    return serialize_settings(row)
+    return model_response(SettingsOut, await db.run_sync(load_settings, user))
 
 
 @router.patch("/settings", response_model=SettingsOut)
-def update_settings(
+async def update_settings(
     payload: SettingsUpdate,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
 ):
-    row = get_or_create_settings(db, user)
+    row = await db.run_sync(get_or_create_settings, user)
     updates = payload.model_dump(exclude_unset=True)
+    if updates.get("no_overlap") is None:
+        updates.pop("no_overlap", None)
+    no_overlap_changed = "no_overlap" in updates and updates["no_overlap"] != row.no_overlap
     for key, value in updates.items():
         setattr(row, key, value)
-    db.commit()
-    db.refresh(row)
+    if no_overlap_changed:
+        # 켤 때 이미 겹친 블록이 있으면 겹침 트리거가 막는다(409).
+        await db.execute(
+            update(ScheduleBlock)
+            .where(ScheduleBlock.user_id == user.id)
+            .values(exclusive=updates["no_overlap"])
+            .execution_options(synchronize_session=False)
+        )
+    await db.commit()
+    # 커밋 뒤에 지운다. 미리 채워 두면 동시에 들어온 쓰기/읽기가 옛 값을 덮어쓸 수 있다.
+    settings_cache.invalidate(user.id)
+    await db.refresh(row)
     return serialize_settings(row)
 
 
 @router.get("/tasks", response_model=list[TaskOut])
-def list_tasks(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+async def list_tasks(
+    limit: int | None = Query(None, ge=1, le=1000),
+    cursor: str | None = None,
+    stream: bool = False,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
 ):
+    # 리비전을 먼저 읽어야 ETag가 실제 데이터보다 앞서지 않는다.
+    headers = conditional_headers(user, await db.scalar(user_revision_stmt(user.id)))
+    cached = not_modified(headers, if_none_match)
+    if cached is not None:
+        return cached
     stmt = (
-        select(Task)
+        select(*TASK_OUT_COLUMNS)
         .where(Task.user_id == user.id)
-        .order_by(Task.created_at.desc())
+        .order_by(Task.created_at.desc(), Task.id.desc())
     )
-    rows = db.execute(stmt).scalars().all()
-    return [serialize_task(row) for row in rows]
+    if cursor:
+        created_at, task_id = parse_cursor(cursor)
+        stmt = stmt.where(tuple_(Task.created_at, Task.id) < tuple_(created_at, task_id))
+    if stream:
+        if limit:
+            stmt = stmt.limit(limit)
+        # 스트림은 자기 세션을 연다. 리비전을 읽은 요청 커넥션은 바로 돌려준다.
+        await db.close()
+        return StreamingResponse(
+            stream_ndjson(stmt),
+            media_type="application/x-ndjson",
+            headers=headers,
+        )
+    if limit:
+        stmt = stmt.limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return Response(content=rows_json(rows), media_type="application/json", headers=headers)
 
 
 @router.post("/tasks", response_model=TaskOut)
-def create_task(
+async def create_task(
     payload: TaskCreate,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
 ):
     priority_tag = payload.priority_tag if payload.priority_tag in PRIORITY_TO_IMPORTANCE else None
     importance = payload.importance
@@ -968,7 +1140,10 @@ def create_task(
     estimated_minutes = payload.estimated_minutes
     estimated_by_ai = False
     if estimated_minutes is None:
-        estimated_minutes = estimate_task_minutes(payload.title, payload.description, payload.deadline)
+        # Gemini 호출은 blocking이라 threadpool에서 돌린다.
+        estimated_minutes = await run_in_threadpool(
+            estimate_task_minutes, payload.title, payload.description, payload.deadline
+        )
         if estimated_minutes is not None:
             estimated_by_ai = True
     if estimated_minutes is None:
@@ -990,20 +1165,21 @@ def create_task(
         status="pending",
     )
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await publish_changes(db, user.id, "tasks")
+    await db.refresh(task)
     return serialize_task(task)
 
 
 @router.patch("/tasks/{task_id}", response_model=TaskOut)
-def update_task(
+async def update_task(
     task_id: str,
     payload: TaskUpdate,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
 ):
     stmt = select(Task).where(Task.id == task_id, Task.user_id == user.id)
-    task = db.execute(stmt).scalar_one_or_none()
+    task = (await db.execute(stmt)).scalar_one_or_none()
     if not task:
         raise HTTPException(status_code=404, detail="task not found")
 
@@ -1025,41 +1201,58 @@ def update_task(
 
     for key, value in updates.items():
         setattr(task, key, value)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    reports.invalidate(user.id)
+    await publish_changes(db, user.id, "tasks")
+    await db.refresh(task)
     return serialize_task(task)
 
 
 @router.delete("/tasks/{task_id}")
-def delete_task(
+async def delete_task(
     task_id: str,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
 ):
     stmt = select(Task).where(Task.id == task_id, Task.user_id == user.id)
-    task = db.execute(stmt).scalar_one_or_none()
+    task = (await db.execute(stmt)).scalar_one_or_none()
     if not task:
         raise HTTPException(status_code=404, detail="task not found")
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
+    reports.invalidate(user.id)
+    # 연결된 블록의 task_id도 SET NULL로 바뀐다.
+    await publish_changes(db, user.id, "tasks", "blocks")
     return {"ok": True}
 
 
 @router.get("/fixed-schedules", response_model=list[FixedScheduleOut])
 def list_fixed_schedules(
+    weekday: int | None = Query(None, ge=0, le=6),
+    if_none_match: str | None = Header(None),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
-    stmt = select(FixedSchedule).where(FixedSchedule.user_id == user.id).order_by(FixedSchedule.created_at.desc())
-    rows = db.execute(stmt).scalars().all()
-    return [serialize_fixed_schedule(row) for row in rows]
+    headers = conditional_headers(user, db.scalar(user_revision_stmt(user.id)))
+    cached = not_modified(headers, if_none_match)
+    if cached is not None:
+        return cached
+    stmt = (
+        select(*FIXED_SCHEDULE_OUT_COLUMNS)
+        .where(FixedSchedule.user_id == user.id)
+        .order_by(FixedSchedule.created_at.desc())
+    )
+    if weekday is not None:
+        stmt = stmt.where(runs_on_weekday(FixedSchedule.days_mask, weekday))
+    rows = db.execute(stmt).all()
+    return Response(content=rows_json(rows), media_type="application/json", headers=headers)
 
 
 @router.post("/fixed-schedules", response_model=FixedScheduleOut)
 def create_fixed_schedule(
     payload: FixedScheduleCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     row = FixedSchedule(
         user_id=user.id,
@@ -1068,9 +1261,11 @@ def create_fixed_schedule(
         start_time=payload.start,
         end_time=payload.end,
         category=payload.category,
+        **recurring_columns(payload.days, payload.start, payload.end),
     )
     db.add(row)
     db.commit()
+    recurrence.invalidate(user.id)
     db.refresh(row)
     return serialize_fixed_schedule(row)
 
@@ -1080,7 +1275,7 @@ def update_fixed_schedule(
     schedule_id: str,
     payload: FixedScheduleUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     stmt = select(FixedSchedule).where(FixedSchedule.id == schedule_id, FixedSchedule.user_id == user.id)
     row = db.execute(stmt).scalar_one_or_none()
@@ -1095,7 +1290,11 @@ def update_fixed_schedule(
             row.end_time = value
         else:
             setattr(row, key, value)
+    if updates.keys() & {"days", "start", "end"}:
+        for key, value in recurring_columns(row.days, row.start_time, row.end_time).items():
+            setattr(row, key, value)
     db.commit()
+    recurrence.invalidate(user.id)
     db.refresh(row)
     return serialize_fixed_schedule(row)
 
@@ -1104,7 +1303,7 @@ def update_fixed_schedule(
 def delete_fixed_schedule(
     schedule_id: str,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     stmt = select(FixedSchedule).where(FixedSchedule.id == schedule_id, FixedSchedule.user_id == user.id)
     row = db.execute(stmt).scalar_one_or_none()
@@ -1112,24 +1311,37 @@ def delete_fixed_schedule(
         raise HTTPException(status_code=404, detail="fixed schedule not found")
     db.delete(row)
     db.commit()
+    recurrence.invalidate(user.id)
     return {"ok": True}
 
 
 @router.get("/blocked-templates", response_model=list[BlockedTemplateOut])
 def list_blocked_templates(
+    weekday: int | None = Query(None, ge=0, le=6),
+    if_none_match: str | None = Header(None),
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
-    stmt = select(BlockedTemplate).where(BlockedTemplate.user_id == user.id).order_by(BlockedTemplate.created_at.desc())
-    rows = db.execute(stmt).scalars().all()
-    return [serialize_blocked_template(row) for row in rows]
+    headers = conditional_headers(user, db.scalar(user_revision_stmt(user.id)))
+    cached = not_modified(headers, if_none_match)
+    if cached is not None:
+        return cached
+    stmt = (
+        select(*BLOCKED_TEMPLATE_OUT_COLUMNS)
+        .where(BlockedTemplate.user_id == user.id)
+        .order_by(BlockedTemplate.created_at.desc())
+    )
+    if weekday is not None:
+        stmt = stmt.where(runs_on_weekday(BlockedTemplate.days_mask, weekday))
+    rows = db.execute(stmt).all()
+    return Response(content=rows_json(rows), media_type="application/json", headers=headers)
 
 
 @router.post("/blocked-templates", response_model=BlockedTemplateOut)
 def create_blocked_template(
     payload: BlockedTemplateCreate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     row = BlockedTemplate(
         user_id=user.id,
@@ -1138,9 +1350,11 @@ def create_blocked_template(
         start_time=payload.start,
         end_time=payload.end,
         block_type=payload.type,
+        **recurring_columns(payload.days, payload.start, payload.end),
     )
     db.add(row)
     db.commit()
+    recurrence.invalidate(user.id)
     db.refresh(row)
     return serialize_blocked_template(row)
 
@@ -1150,7 +1364,7 @@ def update_blocked_template(
     template_id: str,
     payload: BlockedTemplateUpdate,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     stmt = select(BlockedTemplate).where(BlockedTemplate.id == template_id, BlockedTemplate.user_id == user.id)
     row = db.execute(stmt).scalar_one_or_none()
@@ -1167,7 +1381,11 @@ def update_blocked_template(
             row.block_type = value
         else:
             setattr(row, key, value)
+    if updates.keys() & {"days", "start", "end"}:
+        for key, value in recurring_columns(row.days, row.start_time, row.end_time).items():
+            setattr(row, key, value)
     db.commit()
+    recurrence.invalidate(user.id)
     db.refresh(row)
     return serialize_blocked_template(row)
 
@@ -1176,7 +1394,7 @@ def update_blocked_template(
 def delete_blocked_template(
     template_id: str,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     stmt = select(BlockedTemplate).where(BlockedTemplate.id == template_id, BlockedTemplate.user_id == user.id)
     row = db.execute(stmt).scalar_one_or_none()
@@ -1184,46 +1402,74 @@ def delete_blocked_template(
         raise HTTPException(status_code=404, detail="blocked template not found")
     db.delete(row)
     db.commit()
+    recurrence.invalidate(user.id)
     return {"ok": True}
 
 @router.get("/blocks", response_model=list[BlockOut])
-def list_blocks(
+async def list_blocks(
     from_: datetime,
     to: datetime,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    limit: int | None = Query(None, ge=1, le=1000),
+    cursor: str | None = None,
+    stream: bool = False,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
 ):
+    if to <= from_:
+        if stream:
+            return Response(content=b"", media_type="application/x-ndjson")
+        return []
+    headers = conditional_headers(user, await db.scalar(user_revision_stmt(user.id)))
+    cached = not_modified(headers, if_none_match)
+    if cached is not None:
+        return cached
+    # 압축된 옛 블록은 합계만 남아서(/blocks/daily, /reports/summary) 여기에는 나오지 않는다.
+    # 범위가 압축 기준보다 앞이면 헤더로 알려 준다.
+    compacted = compacted_before(datetime.now(timezone.utc), settings.BLOCK_COMPACTION_AFTER_DAYS)
+    if compacted is not None and from_.replace(tzinfo=from_.tzinfo or timezone.utc) < compacted:
+        headers["X-Blocks-Compacted-Before"] = compacted.isoformat().replace("+00:00", "Z")
+    # 범위 앞에서 시작해 걸쳐 들어오는 블록도 포함한다.
     stmt = (
-        select(ScheduleBlock)
+        select(*BLOCK_OUT_COLUMNS)
         .where(
             ScheduleBlock.user_id == user.id,
-            ScheduleBlock.start_at >= from_,
-            ScheduleBlock.start_at < to,
+            overlaps_range(from_, to),
         )
-        .order_by(ScheduleBlock.start_at.asc())
+        .order_by(ScheduleBlock.start_at.asc(), ScheduleBlock.id.asc())
     )
-    blocks = db.execute(stmt).scalars().all()
-    return [
-        {
-            "id": str(b.id),
-            "title": b.title,
-            "note": b.note,
-            "task_id": str(b.task_id) if b.task_id else None,
-            "start_at": b.start_at,
-            "end_at": b.end_at,
-        }
-        for b in blocks
-    ]
+    if cursor:
+        start_at, block_id = parse_cursor(cursor)
+        stmt = stmt.where(tuple_(ScheduleBlock.start_at, ScheduleBlock.id) > tuple_(start_at, block_id))
+    if stream:
+        if limit:
+            stmt = stmt.limit(limit)
+        # 스트림은 자기 세션을 연다. 리비전을 읽은 요청 커넥션은 바로 돌려준다.
+        await db.close()
+        return StreamingResponse(
+            stream_ndjson(stmt),
+            media_type="application/x-ndjson",
+            headers=headers,
+        )
+    if limit:
+        stmt = stmt.limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1].start_at, rows[-1].id)
+    return Response(content=rows_json(rows), media_type="application/json", headers=headers)
 
 
 @router.post("/blocks", response_model=BlockOut)
-def create_block(
+async def create_block(
     payload: BlockCreate,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
 ):
     if payload.end_at <= payload.start_at:
         raise HTTPException(status_code=400, detail="end_at must be after start_at")
+    if payload.end_at - payload.start_at > BLOCK_MAX_DURATION:
+        raise HTTPException(status_code=400, detail="block is too long")
 
     block = ScheduleBlock(
         user_id=user.id,
@@ -1234,8 +1480,10 @@ def create_block(
         end_at=payload.end_at,
     )
     db.add(block)
-    db.commit()
-    db.refresh(block)
+    await db.commit()
+    reports.invalidate(user.id, [payload.start_at])
+    await publish_changes(db, user.id, "blocks")
+    await db.refresh(block)
     return {
         "id": str(block.id),
         "title": block.title,
@@ -1247,15 +1495,15 @@ def create_block(
 
 
 @router.patch("/blocks/{block_id}", response_model=BlockOut)
-def update_block(
+async def update_block(
     block_id: str,
     payload: BlockUpdate,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
 ):
     # 내 블록만 찾기
-    stmt = select(ScheduleBlock).where(ScheduleBlock.id == block_id, ScheduleBlock.user_id == user.id)
-    block = db.execute(stmt).scalar_one_or_none()
+    stmt = select(*BLOCK_OUT_COLUMNS).where(ScheduleBlock.id == block_id, ScheduleBlock.user_id == user.id)
+    block = (await db.execute(stmt)).one_or_none()
     if not block:
         raise HTTPException(status_code=404, detail="block not found")
 
@@ -1268,40 +1516,470 @@ def update_block(
 
     if new_end <= new_start:
         raise HTTPException(status_code=400, detail="end_at must be after start_at")
+    if new_end - new_start > BLOCK_MAX_DURATION:
+        raise HTTPException(status_code=400, detail="block is too long")
 
-    block.title = new_title
-    block.note = new_note
-    block.start_at = new_start
-    block.end_at = new_end
-    block.task_id = new_task_id
+    # 옛 start_at을 조건에 넣어 그 블록이 있는 파티션만 건드린다.
+    stmt = (
+        update(ScheduleBlock.__table__)
+        .where(ScheduleBlock.id == block.id, ScheduleBlock.start_at == block.start_at)
+        .values(title=new_title, note=new_note, start_at=new_start, end_at=new_end, task_id=new_task_id)
+        .returning(*BLOCK_OUT_COLUMNS)
+    )
+    updated = (await db.execute(stmt)).one_or_none()
+    if not updated:
+        # 읽은 뒤에 다른 요청이 옮기거나 지웠다.
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="block not found")
 
-    db.commit()
-    db.refresh(block)
-    return {
-        "id": str(block.id),
-        "title": block.title,
-        "note": block.note,
-        "task_id": str(block.task_id) if block.task_id else None,
-        "start_at": block.start_at,
-        "end_at": block.end_at,
-    }
+    await db.commit()
+    reports.invalidate(user.id, [block.start_at, new_start])
+    await publish_changes(db, user.id, "blocks")
+    return serialize_block_values(updated._mapping)
 
 
 @router.delete("/blocks/{block_id}")
-def delete_block(
+async def delete_block(
     block_id: str,
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
 ):
-    stmt = select(ScheduleBlock).where(ScheduleBlock.id == block_id, ScheduleBlock.user_id == user.id)
-    block = db.execute(stmt).scalar_one_or_none()
-    if not block:
+    stmt = select(ScheduleBlock.start_at).where(ScheduleBlock.id == block_id, ScheduleBlock.user_id == user.id)
+    start_at = (await db.execute(stmt)).scalar_one_or_none()
+    if start_at is None:
         raise HTTPException(status_code=404, detail="block not found")
 
-    db.delete(block)
-    db.commit()
+    # 옛 start_at을 조건에 넣어 그 블록이 있는 파티션만 건드린다.
+    await db.execute(
+        delete(ScheduleBlock.__table__).where(ScheduleBlock.id == block_id, ScheduleBlock.start_at == start_at)
+    )
+    await db.commit()
+    reports.invalidate(user.id, [start_at])
+    await publish_changes(db, user.id, "blocks")
     return {"ok": True}
 
+
+@router.post("/blocks/batch", response_model=BlockBatchResponse)
+async def batch_blocks(
+    payload: BlockBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
+):
+    results: list[dict | None] = [None] * len(payload.ops)
+    creates: list[tuple[int, dict]] = []
+    updates: list[tuple[int, uuid.UUID, BlockBatchOp, uuid.UUID | None]] = []
+    deletes: list[tuple[int, uuid.UUID]] = []
+    seen_ids: set[uuid.UUID] = set()
+    # 리포트 캐시에서 지울 주를 고르는 블록 시작 시각 (옮긴 블록은 옛/새 시각 둘 다)
+    touched: list[datetime] = []
+
+    def fail(index: int, op: BlockBatchOp, error: str, block_id: str | None = None) -> None:
+        results[index] = {"index": index, "op": op.op, "ok": False, "id": block_id, "error": error}
+
+    async def execute_unless_overlap(stmt, params, returning: bool = False) -> list | None:
+        # 겹침(23P01)이면 savepoint만 되돌리고 None을 돌려준다. 앞선 op의 변경은 남는다.
+        try:
+            async with db.begin_nested():
+                result = await db.execute(stmt, params)
+                return result.all() if returning else []
+        except IntegrityError as exc:
+            if not is_overlap_violation(exc):
+                raise
+            return None
+
+    for index, op in enumerate(payload.ops):
+        task_id = None
+        if op.task_id is not None:
+            try:
+                task_id = uuid.UUID(op.task_id)
+            except ValueError:
+                fail(index, op, "invalid task_id", op.id)
+                continue
+
+        if op.op == "create":
+            if not op.title or op.start_at is None or op.end_at is None:
+                fail(index, op, "title, start_at and end_at are required")
+                continue
+            if op.end_at <= op.start_at:
+                fail(index, op, "end_at must be after start_at")
+                continue
+            if op.end_at - op.start_at > BLOCK_MAX_DURATION:
+                fail(index, op, "block is too long")
+                continue
+            creates.append(
+                (
+                    index,
+                    {
+                        "title": op.title,
+                        "note": op.note,
+                        "task_id": task_id,
+                        "start_at": op.start_at,
+                        "end_at": op.end_at,
+                    },
+                )
+            )
+            continue
+
+        try:
+            block_id = uuid.UUID(op.id or "")
+        except ValueError:
+            fail(index, op, "invalid id", op.id)
+            continue
+        if block_id in seen_ids:
+            fail(index, op, "duplicate id in batch", op.id)
+            continue
+        seen_ids.add(block_id)
+        if op.op == "update":
+            updates.append((index, block_id, op, task_id))
+        else:
+            deletes.append((index, block_id))
+
+    # 없는/남의 태스크를 가리키면 FK 오류로 배치 전체가 500이 되므로 그 op만 실패시킨다.
+    task_ids = {values["task_id"] for _, values in creates if values["task_id"] is not None}
+    task_ids |= {task_id for _, _, _, task_id in updates if task_id is not None}
+    if task_ids:
+        owned = set(
+            (await db.execute(select(Task.id).where(Task.user_id == user.id, Task.id.in_(task_ids)))).scalars().all()
+        )
+        for index, values in creates:
+            if values["task_id"] is not None and values["task_id"] not in owned:
+                fail(index, payload.ops[index], "task not found")
+        for index, block_id, op, task_id in updates:
+            if task_id is not None and task_id not in owned:
+                fail(index, op, "task not found", str(block_id))
+        creates = [(index, values) for index, values in creates if results[index] is None]
+        updates = [update for update in updates if results[update[0]] is None]
+
+    # 수정/삭제할 블록을 한 번에 읽고 잠근다. 이후 UPDATE/DELETE는 옛 start_at을 조건에 넣어 해당 파티션만 건드린다.
+    # 잠그지 않으면 그 사이 다른 요청이 옮기거나 지운 블록의 UPDATE가 0행으로 끝나도 성공으로 보고된다.
+    existing = {}
+    if updates or deletes:
+        stmt = (
+            select(*BLOCK_OUT_COLUMNS)
+            .where(
+                ScheduleBlock.user_id == user.id,
+                ScheduleBlock.id.in_(
+                    [block_id for _, block_id, _, _ in updates] + [block_id for _, block_id in deletes]
+                ),
+            )
+            .with_for_update()
+        )
+        try:
+            existing = {row.id: row for row in (await db.execute(stmt)).all()}
+        except DBAPIError as exc:
+            # 잠그기 직전에 다른 요청이 블록을 다른 파티션으로 옮겼다 (serialization_failure).
+            if getattr(exc.orig, "sqlstate", None) != "40001":
+                raise
+            raise HTTPException(status_code=409, detail="blocks changed concurrently, retry") from exc
+
+    if deletes:
+        stmt = (
+            delete(ScheduleBlock.__table__)
+            .where(
+                ScheduleBlock.user_id == user.id,
+                ScheduleBlock.id.in_([block_id for _, block_id in deletes]),
+                ScheduleBlock.start_at.in_(
+                    [existing[block_id].start_at for _, block_id in deletes if block_id in existing]
+                ),
+            )
+            .returning(ScheduleBlock.id, ScheduleBlock.start_at)
+        )
+        deleted = set()
+        for row in (await db.execute(stmt)).all():
+            deleted.add(row.id)
+            touched.append(row.start_at)
+        for index, block_id in deletes:
+            if block_id in deleted:
+                results[index] = {"index": index, "op": "delete", "ok": True, "id": str(block_id)}
+            else:
+                fail(index, payload.ops[index], "block not found", str(block_id))
+
+    if updates:
+        update_params: list[tuple[int, dict]] = []
+        for index, block_id, op, task_id in updates:
+            row = existing.get(block_id)
+            if row is None:
+                fail(index, op, "block not found", str(block_id))
+                continue
+            # update_block과 같은 부분 업데이트 규칙
+            values = {
+                "id": block_id,
+                "title": op.title if op.title is not None else row.title,
+                "note": op.note if op.note is not None else row.note,
+                "task_id": task_id if task_id is not None else row.task_id,
+                "start_at": op.start_at if op.start_at is not None else row.start_at,
+                "end_at": op.end_at if op.end_at is not None else row.end_at,
+            }
+            if values["end_at"] <= values["start_at"]:
+                fail(index, op, "end_at must be after start_at", str(block_id))
+                continue
+            if values["end_at"] - values["start_at"] > BLOCK_MAX_DURATION:
+                fail(index, op, "block is too long", str(block_id))
+                continue
+            update_params.append(
+                (index, {"b_old_start": row.start_at, **{f"b_{key}": value for key, value in values.items()}})
+            )
+            touched.extend((row.start_at, values["start_at"]))
+            results[index] = {
+                "index": index,
+                "op": "update",
+                "ok": True,
+                "id": str(block_id),
+                "block": serialize_block_values(values),
+            }
+        if update_params:
+            # (id, 옛 start_at) 기준 bulk UPDATE (executemany 한 번). ORM은 id로만 찾아서 Core UPDATE를 쓴다.
+            stmt = (
+                update(ScheduleBlock.__table__)
+                .where(ScheduleBlock.id == bindparam("b_id"), ScheduleBlock.start_at == bindparam("b_old_start"))
+                .values(
+                    title=bindparam("b_title"),
+                    note=bindparam("b_note"),
+                    task_id=bindparam("b_task_id"),
+                    start_at=bindparam("b_start_at"),
+                    end_at=bindparam("b_end_at"),
+                )
+            )
+            if await execute_unless_overlap(stmt, [params for _, params in update_params]) is None:
+                # 어느 op가 겹쳤는지 찾으려고 하나씩 다시 실행한다.
+                for index, params in update_params:
+                    if await execute_unless_overlap(stmt, params) is None:
+                        fail(index, payload.ops[index], "block overlaps an existing block", str(params["b_id"]))
+
+    if creates:
+        stmt = insert_blocks_stmt()
+        params = block_insert_params(user.id, [values for _, values in creates])
+        rows = await execute_unless_overlap(stmt, params, returning=True)
+        created = list(zip(creates, rows or []))
+        if rows is None:
+            for (index, values), row_params in zip(creates, params):
+                rows = await execute_unless_overlap(stmt, [row_params], returning=True)
+                if rows is None:
+                    fail(index, payload.ops[index], "block overlaps an existing block")
+                else:
+                    created.append(((index, values), rows[0]))
+        for (index, _), row in created:
+            touched.append(row.start_at)
+            results[index] = {
+                "index": index,
+                "op": "create",
+                "ok": True,
+                "id": str(row.id),
+                "block": serialize_block_values(row._mapping),
+            }
+
+    failed = any(not result["ok"] for result in results)
+    if payload.atomic and failed:
+        await db.rollback()
+        committed = False
+    else:
+        await db.commit()
+        committed = True
+        # 전부 실패했으면 바뀐 게 없다.
+        if any(result["ok"] for result in results):
+            reports.invalidate(user.id, touched)
+            await publish_changes(db, user.id, "blocks")
+    return model_response(BlockBatchResponse, {"committed": committed, "results": results})
+
+
+@router.get("/calendar/week", response_model=CalendarWeekOut)
+async def calendar_week(
+    start: datetime,
+    tz_offset_minutes: int = Query(0, ge=-840, le=840),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
+):
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    end = start + timedelta(days=7)
+    local_tz = timezone(timedelta(minutes=-tz_offset_minutes))
+
+    user_settings = settings_cache.get(user.id)
+    # 쿼리 전에 세대를 잡아 둬야 읽는 도중 바뀐 템플릿/설정이 캐시에 남지 않는다.
+    generation = recurrence.generation(user.id)
+    settings_generation = settings_cache.generation(user.id)
+    stmt = WEEK_BUNDLE_SQL if user_settings is None else WEEK_BUNDLE_NO_SETTINGS_SQL
+    row = (await db.execute(stmt, {"user_id": user.id, "start_at": start, "end_at": end})).one()
+    if user_settings is None:
+        stored = json.loads(row.settings) if row.settings else None
+        if stored is None:
+            # 행은 GET /settings가 만든다. 여기서는 기본값만 보여 준다.
+            user_settings = dict(DEFAULT_SETTINGS)
+        else:
+            user_settings = {key: stored[key] for key in SettingsOut.model_fields}
+            settings_cache.set(user.id, user_settings, settings_generation)
+
+    fixed = json.loads(row.fixed_schedules)
+    blocked = json.loads(row.blocked_templates)
+    start_date = start.astimezone(local_tz).date()
+    range_start = datetime(start_date.year, start_date.month, start_date.day, tzinfo=local_tz)
+    occurrences = recurrence.occurrences_for(
+        user.id, generation, fixed, blocked, range_start, range_start + timedelta(days=7), local_tz
+    )
+    payload = {
+        "start": start,
+        "end": end,
+        "me": {"id": str(user.id), "email": user.email, "name": user.name, "picture": user.picture},
+        "settings": user_settings,
+        "fixed_schedules": fixed,
+        "blocked_templates": blocked,
+        "occurrences": occurrences,
+        "revision": row.revision,
+    }
+    # 블록 JSON은 DB가 만든 문자열을 그대로 붙인다.
+    body = to_json(payload)[:-1] + b',"blocks":' + row.blocks.encode() + b"}"
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/sync", response_model=SyncOut)
+async def sync_changes(
+    since: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
+):
+    # 현재 리비전을 먼저 읽고 그 이하만 돌려준다. 그 뒤의 변경은 다음 sync에서 받는다.
+    state = (
+        await db.execute(
+            select(UserRevision.revision, UserRevision.sync_floor).where(UserRevision.user_id == user.id)
+        )
+    ).first()
+    revision, floor = (state.revision, state.sync_floor) if state else (0, 0)
+    if since > revision or (since and since < floor):
+        raise HTTPException(status_code=410, detail="sync revision expired, reload with since=0")
+
+    upserts = {}
+    deletes = {key: [] for key, _, _ in SYNC_ENTITIES}
+    for key, model, columns in SYNC_ENTITIES:
+        stmt = select(*columns).where(model.user_id == user.id, model.revision <= revision)
+        if since:
+            stmt = stmt.where(model.revision > since)
+        upserts[key] = [row._asdict() for row in (await db.execute(stmt)).all()]
+    if since:
+        # since=0은 전체 스냅샷이라 삭제 목록이 필요 없다.
+        tombstones = await db.execute(
+            select(SyncTombstone.entity, SyncTombstone.entity_id).where(
+                SyncTombstone.user_id == user.id,
+                SyncTombstone.revision > since,
+                SyncTombstone.revision <= revision,
+            )
+        )
+        for entity, entity_id in tombstones:
+            deletes[ENTITY_KEYS[entity]].append(str(entity_id))
+    payload = {"revision": revision, "upserts": upserts, "deletes": deletes}
+    return Response(content=to_json(payload), media_type="application/json")
+
+
+@router.get("/events")
+async def change_events(
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
+):
+    # 인증에 쓴 DB 커넥션은 바로 돌려준다. 스트림이 열려 있는 동안 풀을 잡지 않게 한다.
+    await db.close()
+    subscription = change_hub.subscribe(user.id, settings.EVENTS_MAX_PER_USER)
+    if subscription is None:
+        raise HTTPException(status_code=429, detail="too many event streams")
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                entities, revision = await subscription.wait(settings.EVENTS_KEEPALIVE_SECONDS)
+                if entities:
+                    data = json.dumps({"entities": sorted(entities), "revision": revision})
+                    yield f"event: change\ndata: {data}\n\n"
+                else:
+                    yield ": keepalive\n\n"
+        finally:
+            change_hub.unsubscribe(user.id, subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/blocks/conflicts", response_model=list[BlockOut])
+async def list_block_conflicts(
+    start_at: datetime,
+    end_at: datetime,
+    exclude_id: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
+):
+    if end_at <= start_at:
+        raise HTTPException(status_code=400, detail="end_at must be after start_at")
+    stmt = select(*BLOCK_OUT_COLUMNS).where(
+        ScheduleBlock.user_id == user.id,
+        overlaps_range(start_at, end_at),
+    )
+    if exclude_id:
+        try:
+            stmt = stmt.where(ScheduleBlock.id != uuid.UUID(exclude_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid exclude_id")
+    rows = (await db.execute(stmt.order_by(ScheduleBlock.start_at.asc()))).all()
+    return model_response(list[BlockOut], [serialize_block_values(row._mapping) for row in rows])
+
+
+async def _ensure_summary_offset(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    start: datetime,
+    end: datetime,
+    tz_offset_minutes: int,
+) -> None:
+    # 압축된 기간은 UTC 정시 단위로만 남아 있어서 정시가 아닌 시간대로는 날짜를 나눌 수 없다.
+    if tz_offset_minutes % 60 == 0:
+        return
+    if (await db.execute(summary_exists_stmt(user_id, start, end))).scalar_one():
+        raise HTTPException(status_code=400, detail="tz_offset_minutes must be a whole hour for compacted ranges")
+
+
+@router.get("/blocks/daily", response_model=list[BlockDailyOut])
+async def list_block_daily_totals(
+    from_: datetime,
+    to: datetime,
+    tz_offset_minutes: int = Query(0, ge=-840, le=840),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
+):
+    # 날짜별 블록 합계. 압축된 옛 기간은 block_daily_summary에서, 최근 기간은 원본 블록에서 읽는다.
+    if to <= from_:
+        return []
+    await _ensure_summary_offset(db, user.id, from_, to, tz_offset_minutes)
+    stmt = daily_totals_stmt(user.id, from_, to, tz_offset_minutes)
+    rows = (await db.execute(stmt)).all()
+    return model_response(list[BlockDailyOut], [row._asdict() for row in rows])
+
+
+@router.get("/reports/summary", response_model=ReportSummaryOut)
+async def report_summary(
+    from_: datetime,
+    to: datetime,
+    group_by: Literal["day", "category", "task"] = "day",
+    tz_offset_minutes: int = Query(0, ge=-840, le=840),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
+):
+    # 블록 합계/카테고리/태스크별 분포와 완료율. 응답 크기는 블록 수가 아니라 날짜/카테고리/태스크 수를 따른다.
+    if from_.tzinfo is None:
+        from_ = from_.replace(tzinfo=timezone.utc)
+    if to.tzinfo is None:
+        to = to.replace(tzinfo=timezone.utc)
+    if to <= from_:
+        raise HTTPException(status_code=400, detail="to must be after from")
+    if to - from_ > timedelta(days=settings.REPORT_MAX_RANGE_DAYS):
+        raise HTTPException(status_code=400, detail="range too long")
+    await _ensure_summary_offset(db, user.id, from_, to, tz_offset_minutes)
+    rows, days = await reports.rows(db, user.id, from_, to, tz_offset_minutes)
+    return model_response(
+        ReportSummaryOut,
+        {"start": from_, "end": to, "group_by": group_by, **summarize_rows(rows, group_by, days)},
+    )
+
+
 def _gemini_generate_text(body: dict) -> str:
     resp = requests.post(
         f"https://generativelanguage.googleapis.com/v1beta/models/{settings.GEMINI_MODEL}:generateContent",
@@ -1328,6 +2006,15 @@ def _gemini_generate_text(body: dict) -> str:
     return text
 
 
+def serialize_created_block(row) -> dict:
+    return {
+        "id": str(row.id),
+        "title": row.title,
+        "start_at": row.start_at,
+        "end_at": row.end_at,
+    }
+
+
 def _format_korean_datetime(dt: datetime) -> str:
     hour = dt.hour
     minute = dt.minute
@@ -1346,12 +2033,12 @@ def _format_korean_datetime(dt: datetime) -> str:
 def ai_chat(
     payload: ChatRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     if not settings.GEMINI_API_KEY:
         raise HTTPException(status_code=500, detail="gemini api key not configured")
 
-    user_settings = get_or_create_settings(db, user)
+    user_settings = load_settings(db, user)
 
     context = payload.context
     now_utc = context.now if context and context.now else datetime.now(timezone.utc)
@@ -1454,7 +2141,7 @@ def ai_chat(
                 return f"{parts[0].zfill(2)}:{parts[1].zfill(2)}:00"
             return t
 
-        created_blocks = []
+        pending_blocks = []
         failed_count = 0
 
         for event in events:
@@ -1496,31 +2183,19 @@ def ai_chat(
             start_utc = start_local.astimezone(timezone.utc)
             end_utc = end_local.astimezone(timezone.utc)
 
-            if start_utc < now_utc:
+            if start_utc < now_utc or end_utc - start_utc > BLOCK_MAX_DURATION:
                 failed_count += 1
                 continue
 
-            block = ScheduleBlock(
-                user_id=user.id,
-                title=title,
-                note=note,
-                start_at=start_utc,
-                end_at=end_utc,
-            )
-            db.add(block)
-            db.flush()
-
-            created_blocks.append(
-                {
-                    "id": str(block.id),
-                    "title": block.title,
-                    "start_at": block.start_at,
-                    "end_at": block.end_at,
-                }
-            )
+            pending_blocks.append({"title": title, "note": note, "start_at": start_utc, "end_at": end_utc})
 
+        created_blocks = [
+            serialize_created_block(row) for row in insert_blocks(db, user.id, pending_blocks)
+        ]
         if created_blocks:
             db.commit()
+            reports.invalidate(user.id, [block["start_at"] for block in pending_blocks])
+            publish_changes_sync(db, user.id, "blocks")
         else:
             db.rollback()
 
@@ -1563,30 +2238,26 @@ def ai_chat(
         if end_date < start_date:
             end_date = start_date
 
-        start_min, end_min = normalize_grid_bounds(user_settings.grid_start, user_settings.grid_end)
-        focus_minutes = user_settings.focus_duration
-        break_minutes = user_settings.break_duration
+        start_min, end_min = normalize_grid_bounds(user_settings["grid_start"], user_settings["grid_end"])
+        focus_minutes = user_settings["focus_duration"]
+        break_minutes = user_settings["break_duration"]
 
         range_start_local = datetime(start_date.year, start_date.month, start_date.day, tzinfo=local_tz)
         range_end_local = datetime(end_date.year, end_date.month, end_date.day, tzinfo=local_tz) + timedelta(days=1)
         range_start_utc = range_start_local.astimezone(timezone.utc)
         range_end_utc = range_end_local.astimezone(timezone.utc)
 
-        existing_blocks = db.execute(
-            select(ScheduleBlock).where(
+        generation, template_stmts = recurrence.prefetch_stmts(user.id)
+        existing_blocks, *template_rows = fetch_pipelined(
+            db,
+            select(ScheduleBlock.start_at, ScheduleBlock.end_at).where(
                 ScheduleBlock.user_id == user.id,
-                ScheduleBlock.start_at < range_end_utc,
-                ScheduleBlock.end_at > range_start_utc,
-            )
-        ).scalars().all()
-
-        fixed_schedules = db.execute(
-            select(FixedSchedule).where(FixedSchedule.user_id == user.id)
-        ).scalars().all()
-
-        blocked_templates = db.execute(
-            select(BlockedTemplate).where(BlockedTemplate.user_id == user.id)
-        ).scalars().all()
+                overlaps_range(range_start_utc, range_end_utc),
+            ),
+            *template_stmts,
+        )
+        recurrence.prime_rows(user.id, generation, template_rows)
+        recurring = recurrence.occurrences(db, user.id, range_start_utc, range_end_utc, local_tz)
 
         proposed = plan_study_blocks(
             title=title,
@@ -1601,8 +2272,7 @@ def ai_chat(
             now_local=now_local,
             local_tz=local_tz,
             existing_blocks=existing_blocks,
-            fixed_schedules=fixed_schedules,
-            blocked_templates=blocked_templates,
+            recurring=recurring,
         )
 
         if not proposed:
@@ -1612,28 +2282,23 @@ def ai_chat(
                 "created_blocks": [],
             }
 
-        created_blocks = []
-        for block in proposed:
-            start_utc = block["start_at"].astimezone(timezone.utc)
-            end_utc = block["end_at"].astimezone(timezone.utc)
-            new_block = ScheduleBlock(
-                user_id=user.id,
-                title=block["title"],
-                start_at=start_utc,
-                end_at=end_utc,
-            )
-            db.add(new_block)
-            db.flush()
-            created_blocks.append(
+        rows = insert_blocks(
+            db,
+            user.id,
+            [
                 {
-                    "id": str(new_block.id),
-                    "title": new_block.title,
-                    "start_at": new_block.start_at,
-                    "end_at": new_block.end_at,
+                    "title": block["title"],
+                    "start_at": block["start_at"].astimezone(timezone.utc),
+                    "end_at": block["end_at"].astimezone(timezone.utc),
                 }
-            )
+                for block in proposed
+            ],
+        )
+        created_blocks = [serialize_created_block(row) for row in rows]
 
         db.commit()
+        reports.invalidate(user.id, [row.start_at for row in rows])
+        publish_changes_sync(db, user.id, "blocks")
         hours = round(total_minutes / 60, 1)
         reply = f"시험 전날까지 총 {hours}시간 분량으로 고르게 배치했어요. 필요하면 조정해 드릴게요."
 
@@ -1644,7 +2309,7 @@ def ai_chat(
 def ai_schedule(
     payload: ScheduleRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     if not payload.tasks:
         return {"proposed_blocks": [], "unscheduled": []}
@@ -1671,82 +2336,173 @@ def ai_schedule(
     if not tasks:
         return {"proposed_blocks": [], "unscheduled": []}
 
-    schedule_request = ScheduleRequest(
-        **payload.model_dump(exclude={"tasks"}),
-        tasks=tasks,
+    schedule_request = normalize_schedule_request(
+        ScheduleRequest(
+            **payload.model_dump(exclude={"tasks"}),
+            tasks=tasks,
+        )
     )
+    key = (str(user.id), schedule_request_hash(schedule_request))
 
-    result = gemini_schedule(schedule_request)
-    if result is None:
-        proposed, unscheduled = rule_based_schedule(schedule_request)
-    else:
-        proposed, unscheduled = result
+    cached = schedule_cache.get(key)
+    if cached is not None:
+        return cached
 
-    return {
-        "proposed_blocks": proposed,
-        "unscheduled": unscheduled,
-    }
+    def compute() -> dict:
+        result = gemini_schedule(schedule_request)
+        if result is None:
+            proposed, unscheduled = rule_based_schedule(schedule_request)
+        else:
+            proposed, unscheduled = result
+        response = {
+            "proposed_blocks": proposed,
+            "unscheduled": unscheduled,
+        }
+        schedule_cache.set(key, response)
+        return response
+
+    return schedule_flight.do(key, compute)
+
+
+@router.post("/schedule/apply", response_model=ScheduleApplyResponse)
+async def apply_schedule(
+    payload: ScheduleApplyRequest,
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
+    db: AsyncSession = Depends(get_async_db),
+    user: AuthUser = Depends(get_current_user),
+):
+    payload_hash = hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= 255:
+        raise HTTPException(status_code=400, detail="invalid Idempotency-Key")
+
+    def replay(stored_hash: str, response: dict) -> dict:
+        if stored_hash != payload_hash:
+            raise HTTPException(status_code=409, detail="idempotency key reused with a different payload")
+        return response
+
+    async def run() -> dict:
+        try:
+            task_ids = {uuid.UUID(block.task_id) for block in payload.proposed_blocks}
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid task_id")
+        for block in payload.proposed_blocks:
+            if block.end_at <= block.start_at:
+                raise HTTPException(status_code=400, detail="end_at must be after start_at")
+            if block.end_at - block.start_at > BLOCK_MAX_DURATION:
+                raise HTTPException(status_code=400, detail="block is too long")
+
+        owned = set()
+        if task_ids:
+            owned = set(
+                (
+                    await db.execute(select(Task.id).where(Task.user_id == user.id, Task.id.in_(task_ids)))
+                ).scalars().all()
+            )
+        if owned != task_ids:
+            raise HTTPException(status_code=404, detail="task not found")
+
+        if idempotency_key:
+            # 다른 워커가 같은 키로 적용 중이면 그 커밋을 기다렸다가 저장된 응답을 돌려준다.
+            ttl = timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+            stored = await claim_apply_key(db, user.id, idempotency_key, payload_hash, ttl)
+            if stored is not None:
+                await db.rollback()
+                apply_cache.set((user.id, idempotency_key), (stored.payload_hash, stored.response))
+                return replay(stored.payload_hash, stored.response)
+
+        deleted_count = 0
+        rows = []
+        if task_ids:
+            replace_from = payload.replace_from or datetime.now(timezone.utc)
+            deleted = await db.execute(
+                delete(ScheduleBlock)
+                .where(
+                    ScheduleBlock.user_id == user.id,
+                    ScheduleBlock.task_id.in_(task_ids),
+                    ScheduleBlock.start_at >= replace_from,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            deleted_count = deleted.rowcount
+
+            params = block_insert_params(
+                user.id,
+                [
+                    {
+                        "task_id": uuid.UUID(block.task_id),
+                        "title": block.title,
+                        "note": payload.note,
+                        "start_at": block.start_at,
+                        "end_at": block.end_at,
+                    }
+                    for block in payload.proposed_blocks
+                ],
+            )
+            rows = (await db.execute(insert_blocks_stmt(), params)).all()
+
+            await db.execute(
+                update(Task)
+                .where(Task.user_id == user.id, Task.id.in_(task_ids))
+                .values(status="scheduled")
+                .execution_options(synchronize_session=False)
+            )
+
+        response = {
+            "blocks": [serialize_block_values(row._mapping) for row in rows],
+            "deleted_count": deleted_count,
+            "scheduled_task_ids": sorted(str(task_id) for task_id in task_ids),
+            "unscheduled": [item.model_dump() for item in payload.unscheduled],
+        }
+        if idempotency_key:
+            # 키와 응답을 적용과 같은 트랜잭션에서 커밋한다.
+            await store_apply_response(db, user.id, idempotency_key, response)
+        if task_ids or idempotency_key:
+            await db.commit()
+        if task_ids:
+            # 태스크 상태도 바뀌어서(완료율) 유저 주를 모두 지운다.
+            reports.invalidate(user.id)
+            await publish_changes(db, user.id, "blocks", "tasks")
+        if idempotency_key:
+            apply_cache.set((user.id, idempotency_key), (payload_hash, response))
+        return response
+
+    if not idempotency_key:
+        return await run()
+
+    cached = apply_cache.get((user.id, idempotency_key))
+    if cached is not None:
+        return replay(*cached)
+    return await apply_flight.do((user.id, idempotency_key, payload_hash), run)
 
 
 @router.post("/ai/reschedule", response_model=RescheduleResponse)
 def ai_reschedule(
     payload: RescheduleRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     now = payload.now or datetime.now(timezone.utc)
-
-    tasks = db.execute(
-        select(Task).where(Task.user_id == user.id, Task.status != "done")
-    ).scalars().all()
-    if not tasks:
-        return {"proposed_blocks": [], "unscheduled": [], "notifications": []}
-
-    blocks = db.execute(
-        select(ScheduleBlock).where(
+    if payload.week_end <= payload.week_start:
+        raise HTTPException(status_code=400, detail="week_end must be after week_start")
+
+    # 서로 독립인 읽기는 한 번의 왕복으로 보낸다.
+    generation, template_stmts = recurrence.prefetch_stmts(user.id)
+    overdue_rows, blocks, *template_rows = fetch_pipelined(
+        db,
+        overdue_tasks_stmt(user.id, payload.week_start, payload.week_end, now),
+        select(ScheduleBlock.start_at, ScheduleBlock.end_at).where(
             ScheduleBlock.user_id == user.id,
-            ScheduleBlock.start_at >= payload.week_start,
-            ScheduleBlock.start_at < payload.week_end,
-        )
-    ).scalars().all()
-
-    fixed = db.execute(
-        select(FixedSchedule).where(FixedSchedule.user_id == user.id)
-    ).scalars().all()
-    blocked = db.execute(
-        select(BlockedTemplate).where(BlockedTemplate.user_id == user.id)
-    ).scalars().all()
-
-    overdue_tasks = []
-    notifications = []
-
-    for task in tasks:
-        task_blocks = [b for b in blocks if b.task_id == task.id]
-        if any(b.end_at >= now for b in task_blocks):
-            continue
-        past_minutes = sum(
-            max(0, int((b.end_at - b.start_at).total_seconds() / 60)) for b in task_blocks if b.end_at < now
-        )
-        remaining = max(0, task.estimated_minutes - past_minutes)
-        if remaining <= 0:
-            continue
-        overdue_tasks.append(
-            {
-                "id": str(task.id),
-                "title": task.title,
-                "estimated_minutes": remaining,
-                "deadline": task.deadline,
-                "importance": task.importance,
-                "priority_tag": task.priority_tag,
-                "splittable": task.splittable,
-                "preferred_time": task.preferred_time,
-                "focus_need": task.focus_need,
-            }
-        )
+            overlaps_range(payload.week_start, payload.week_end),
+        ),
+        *template_stmts,
+    )
+    recurrence.prime_rows(user.id, generation, template_rows)
 
+    overdue_tasks = [{**row._asdict(), "id": str(row.id)} for row in overdue_rows]
     if not overdue_tasks:
         return {"proposed_blocks": [], "unscheduled": [], "notifications": []}
 
+    fixed, blocked = recurrence.templates(db, user.id)
     schedule_request = ScheduleRequest(
         week_start=payload.week_start,
         week_end=payload.week_end,
@@ -1754,14 +2510,12 @@ def ai_reschedule(
         end_hour=payload.end_hour,
         now=now,
         tasks=overdue_tasks,
-        existing_blocks=[
-            {"start_at": b.start_at, "end_at": b.end_at} for b in blocks
-        ],
+        existing_blocks=[block._asdict() for block in blocks],
         fixed_schedules=[
-            {"days": f.days, "start": f.start_time, "end": f.end_time} for f in fixed
+            {"days": f["days"], "start": f["start"], "end": f["end"]} for f in fixed
         ],
         blocked_templates=[
-            {"days": t.days, "start": t.start_time, "end": t.end_time} for t in blocked
+            {"days": t["days"], "start": t["start"], "end": t["end"]} for t in blocked
         ],
         blocked_ranges=payload.blocked_ranges,
     )
@@ -1772,19 +2526,25 @@ def ai_reschedule(
     else:
         proposed, unscheduled = result
 
-    for block in proposed:
-        new_block = ScheduleBlock(
-            user_id=user.id,
-            task_id=uuid.UUID(block["task_id"]),
-            title=block["title"],
-            note="AI 재배치",
-            start_at=block["start_at"],
-            end_at=block["end_at"],
-        )
-        db.add(new_block)
-        notifications.append(f"'{block['title']}' 태스크가 자동 재배치되었습니다.")
+    insert_blocks(
+        db,
+        user.id,
+        [
+            {
+                "task_id": uuid.UUID(block["task_id"]),
+                "title": block["title"],
+                "note": "AI 재배치",
+                "start_at": block["start_at"],
+                "end_at": block["end_at"],
+            }
+            for block in proposed
+        ],
+    )
+    notifications = [f"'{block['title']}' 태스크가 자동 재배치되었습니다." for block in proposed]
 
     db.commit()
+    reports.invalidate(user.id, [block["start_at"] for block in proposed])
+    publish_changes_sync(db, user.id, "blocks")
 
     return {
         "proposed_blocks": proposed,
@@ -2,12 +2,45 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_PRE_PING: bool = True
+    DB_READY_TIMEOUT_SECONDS: float = 2
+    # /metrics/db에 Authorization: Bearer <토큰>으로 접근한다. 없으면 그 라우트는 404다.
+    METRICS_TOKEN: str | None = None
     CORS_ORIGINS: str = "http://localhost:5173"
     GOOGLE_CLIENT_ID: str
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v1/certs"
+    GOOGLE_CERTS_FILE: str | None = None
+    GOOGLE_CERTS_PREWARM: bool = True
     JWT_SECRET: str
+    USER_CACHE_TTL_SECONDS: float = 300
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_TRUST_JWT_CLAIMS: bool = False
     GEMINI_API_KEY: str | None = None
     GEMINI_MODEL: str = "gemini-2.5-flash"
     GEMINI_SYSTEM_PROMPT: str = "You are TimeGrid AI scheduling assistant. Reply in Korean."
+    AI_SCHEDULE_CACHE_TTL_SECONDS: float = 30
+    # 설정 캐시는 워커 프로세스마다 따로다. 다른 워커에서 바꾼 설정은 이 시간까지 옛 값으로 보일 수 있다.
+    SETTINGS_CACHE_TTL_SECONDS: float = 300
+    RECURRENCE_CACHE_TTL_SECONDS: float = 300
+    RECURRENCE_CACHE_MAX_USERS: int = 10000
+    IDEMPOTENCY_TTL_SECONDS: float = 600
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+    SYNC_COMPACTION_INTERVAL_SECONDS: float = 3600
+    BLOCK_PARTITION_MONTHS_AHEAD: int = 12
+    BLOCK_PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 86400
+    # 이 일수보다 오래된 달의 블록을 block_daily_summary로 압축한다. None이면 끈다.
+    BLOCK_COMPACTION_AFTER_DAYS: int | None = None
+    BLOCK_COMPACTION_ARCHIVE: bool = True
+    BLOCK_COMPACTION_INTERVAL_SECONDS: float = 86400
+    REPORT_CACHE_TTL_SECONDS: float = 300
+    REPORT_CACHE_MAX_WEEKS: int = 50000
+    REPORT_MAX_RANGE_DAYS: int = 366
+    EVENTS_KEEPALIVE_SECONDS: float = 25
+    EVENTS_MAX_PER_USER: int = 10
 
     class Config:
         env_file = ".env"
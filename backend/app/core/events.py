@@ -0,0 +1,82 @@
+import asyncio
+import uuid
+from typing import Iterable
+
+
+# 연결 하나의 구독. 알림을 쌓아 두지 않고 바뀐 엔티티 이름과 가장 큰 리비전만 합쳐 두어서
+# 느린 클라이언트가 있어도 메모리가 늘지 않는다.
+class ChangeSubscription:
+    def __init__(self):
+        self.pending: set[str] = set()
+        self.revision = 0
+        self._event = asyncio.Event()
+
+    def push(self, entities: Iterable[str], revision: int) -> None:
+        self.pending.update(entities)
+        self.revision = max(self.revision, revision)
+        self._event.set()
+
+    async def wait(self, timeout: float) -> tuple[set[str], int]:
+        # (바뀐 엔티티, 커밋된 유저 리비전). 타임아웃이면 빈 set.
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return set(), self.revision
+        self._event.clear()
+        pending, self.pending = self.pending, set()
+        return pending, self.revision
+
+
+# 프로세스 안 pub/sub. 구독은 이벤트 루프에서만 다루고,
+# 스레드풀(sync 라우트)에서의 publish는 루프로 넘긴다.
+class ChangeHub:
+    def __init__(self):
+        self._subscribers: dict[uuid.UUID, set[ChangeSubscription]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def subscribe(self, user_id: uuid.UUID, limit: int | None = None) -> ChangeSubscription | None:
+        # limit개가 이미 열려 있으면 None. 확인과 등록 사이에 await가 없어서 동시 요청도 limit을 넘지 못한다.
+        self._loop = asyncio.get_running_loop()
+        subscriptions = self._subscribers.setdefault(user_id, set())
+        if limit is not None and len(subscriptions) >= limit:
+            if not subscriptions:
+                del self._subscribers[user_id]
+            return None
+        subscription = ChangeSubscription()
+        subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id: uuid.UUID, subscription: ChangeSubscription) -> None:
+        subscriptions = self._subscribers.get(user_id)
+        if not subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[user_id]
+
+    def count(self, user_id: uuid.UUID) -> int:
+        return len(self._subscribers.get(user_id, ()))
+
+    def has_subscribers(self, user_id: uuid.UUID) -> bool:
+        return user_id in self._subscribers
+
+    def publish(self, user_id: uuid.UUID, revision: int, *entities: str) -> None:
+        # revision은 이 변경을 포함하는 커밋된 유저 리비전. 클라이언트는 /sync?since=로 그만큼 당겨 온다.
+        loop = self._loop
+        if loop is None or user_id not in self._subscribers:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(user_id, revision, entities)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, user_id, revision, entities)
+
+    def _dispatch(self, user_id: uuid.UUID, revision: int, entities: tuple[str, ...]) -> None:
+        for subscription in self._subscribers.get(user_id, ()):
+            subscription.push(entities, revision)
+
+
+change_hub = ChangeHub()
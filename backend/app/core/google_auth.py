@@ -0,0 +1,153 @@
+import json
+import logging
+import re
+import threading
+import time
+
+import requests
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt as google_jwt
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(cache_control: str | None, fallback: int) -> int:
+    if not cache_control:
+        return fallback
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match:
+        return fallback
+    return int(match.group(1))
+
+
+# Google 서명 인증서를 Cache-Control max-age 동안 메모리에 들고 있는다.
+# 토큰 검증은 로컬 암호 연산만 하고, 네트워크는 만료/키 교체 때만 탄다.
+class GoogleCertCache:
+    def __init__(
+        self,
+        url: str = GOOGLE_CERTS_URL,
+        session: requests.Session | None = None,
+        fallback_ttl: int = 3600,
+        refresh_margin: int = 300,
+        min_refresh_interval: int = 60,
+    ):
+        self.url = url
+        self.fallback_ttl = fallback_ttl
+        self.refresh_margin = refresh_margin
+        self.min_refresh_interval = min_refresh_interval
+        # keep-alive 커넥션을 재사용한다.
+        self._session = session or requests.Session()
+        self._certs: dict | None = None
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._pinned = False
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def install(self, certs: dict) -> None:
+        # 테스트/로컬용: 고정 인증서를 넣으면 네트워크를 타지 않는다.
+        with self._lock:
+            self._certs = dict(certs)
+            self._expires_at = float("inf")
+            self._fetched_at = time.monotonic()
+            self._pinned = True
+
+    def install_file(self, path: str) -> None:
+        with open(path, encoding="utf-8") as fp:
+            self.install(json.load(fp))
+
+    def refresh(self) -> dict:
+        with self._refresh_lock:
+            resp = self._session.get(self.url, timeout=10)
+            resp.raise_for_status()
+            certs = resp.json()
+            max_age = parse_max_age(resp.headers.get("Cache-Control"), self.fallback_ttl)
+            now = time.monotonic()
+            with self._lock:
+                if self._pinned:
+                    return self._certs
+                self._certs = certs
+                self._expires_at = now + max_age
+                self._fetched_at = now
+            return certs
+
+    def get(self) -> dict:
+        with self._lock:
+            certs, expires_at = self._certs, self._expires_at
+        if certs is not None and time.monotonic() < expires_at:
+            return certs
+        # 동시에 만료를 본 요청들은 한 번만 가져오게 한다.
+        with self._refresh_lock:
+            with self._lock:
+                certs, expires_at = self._certs, self._expires_at
+            if certs is not None and time.monotonic() < expires_at:
+                return certs
+            return self.refresh()
+
+    def _refresh_for_unknown_kid(self, kid: str | None) -> dict:
+        with self._lock:
+            certs, fetched_at, pinned = self._certs, self._fetched_at, self._pinned
+        if pinned or kid is None or time.monotonic() - fetched_at < self.min_refresh_interval:
+            return certs
+        return self.refresh()
+
+    def verify(self, token: str, audience: str, clock_skew_in_seconds: int = 0) -> dict:
+        certs = self.get()
+        kid = google_jwt.decode_header(token).get("kid")
+        if kid not in certs:
+            # 키 교체 직후면 한 번만 다시 받아 본다.
+            certs = self._refresh_for_unknown_kid(kid)
+        idinfo = google_jwt.decode(
+            token,
+            certs=certs,
+            audience=audience,
+            clock_skew_in_seconds=clock_skew_in_seconds,
+        )
+        if idinfo.get("iss") not in GOOGLE_ISSUERS:
+            raise google_exceptions.GoogleAuthError("wrong issuer")
+        return idinfo
+
+    def prewarm(self) -> None:
+        try:
+            self.get()
+        except Exception:
+            logger.warning("google cert prewarm failed", exc_info=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                expires_at, pinned = self._expires_at, self._pinned
+            if pinned:
+                return
+            wait = max(1.0, expires_at - self.refresh_margin - time.monotonic())
+            if self._stop.wait(wait):
+                return
+            try:
+                self.refresh()
+            except Exception:
+                logger.warning("google cert refresh failed", exc_info=True)
+                self._stop.wait(self.min_refresh_interval)
+
+    def start_background_refresh(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="google-cert-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+google_certs = GoogleCertCache(settings.GOOGLE_CERTS_URL)
+if settings.GOOGLE_CERTS_FILE:
+    google_certs.install_file(settings.GOOGLE_CERTS_FILE)
@@ -0,0 +1,33 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+
+# 이미 JSON으로 인코딩된 응답 본문
+class JSONBytes(bytes):
+    pass
+
+
+# stdlib json.dumps 대신 pydantic-core로 바로 바이트를 만든다. datetime/UUID도 그대로 처리한다.
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, JSONBytes):
+            return bytes(content)
+        return to_json(content)
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_model) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+# response_model과 같은 타입으로 검증한 뒤 미리 만든 TypeAdapter의 dump_json 한 번으로 본문을 만든다.
+# 라우트가 이 응답을 돌려주면 FastAPI의 검증 -> dump_python -> 렌더 단계를 건너뛴다.
+# response_model은 라우트에 그대로 둬서 OpenAPI 문서는 바뀌지 않는다.
+def model_response(response_model, content: Any, **kwargs) -> FastJSONResponse:
+    adapter = _adapter(response_model)
+    value = adapter.validate_python(content, from_attributes=True)
+    return FastJSONResponse(JSONBytes(adapter.dump_json(value, by_alias=True)), **kwargs)
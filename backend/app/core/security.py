@@ -1,13 +1,25 @@
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from jose import jwt
 
 ALGO = "HS256"
 COOKIE_NAME = "tg_access"
 
-def create_access_token(user_id: str, secret: str, minutes: int = 60 * 24 * 7) -> str:
+
+# 인증된 요청에서 라우트가 쓰는 유저 정보. 요청 간 캐시되므로 ORM 객체 대신 불변 값으로 둔다.
+@dataclass(frozen=True)
+class AuthUser:
+    id: uuid.UUID
+    email: str | None = None
+    name: str | None = None
+    picture: str | None = None
+
+
+def create_access_token(user_id: str, secret: str, minutes: int = 60 * 24 * 7, claims: dict | None = None) -> str:
     now = datetime.now(timezone.utc)
     exp = now + timedelta(minutes=minutes)
-    payload = {"sub": user_id, "iat": int(now.timestamp()), "exp": int(exp.timestamp())}
+    payload = {**(claims or {}), "sub": user_id, "iat": int(now.timestamp()), "exp": int(exp.timestamp())}
     return jwt.encode(payload, secret, algorithm=ALGO)
 
 def decode_access_token(token: str, secret: str) -> dict:
@@ -0,0 +1,135 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, Integer, Row, and_, case, func, insert, literal, literal_column, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.schedule_block import ScheduleBlock
+from app.models.task import Task
+
+# 블록 최대 길이. DB CHECK(ck_schedule_blocks_max_duration)와 겹침 트리거도 같은 값을 쓴다.
+# 길이에 상한이 있어야 범위 조회에서 start_at 하한으로 이전 달 파티션을 건너뛸 수 있다.
+BLOCK_MAX_DURATION = timedelta(days=31)
+
+# BlockOut을 만드는 데 필요한 컬럼
+BLOCK_OUT_COLUMNS = (
+    ScheduleBlock.id,
+    ScheduleBlock.title,
+    ScheduleBlock.note,
+    ScheduleBlock.task_id,
+    ScheduleBlock.start_at,
+    ScheduleBlock.end_at,
+)
+
+
+def block_period():
+    # ix_schedule_blocks_user_period 인덱스 식과 똑같아야 인덱스를 탄다.
+    return func.tstzrange(ScheduleBlock.start_at, ScheduleBlock.end_at, literal_column("'[)'"))
+
+
+def overlaps_range(start: datetime, end: datetime):
+    # start_at < end AND end_at > start 와 같은 뜻. GiST 인덱스로 한 번에 찾는다.
+    # start_at < end는 겹침 조건에 이미 들어 있지만, 파티션 키 조건이라 end 이후 달 파티션을 건너뛰게 한다.
+    # 블록은 BLOCK_MAX_DURATION보다 길 수 없으니 start_at > start - BLOCK_MAX_DURATION으로 이전 달도 건너뛴다.
+    period = func.tstzrange(
+        literal(start, DateTime(timezone=True)),
+        literal(end, DateTime(timezone=True)),
+        literal_column("'[)'"),
+    )
+    return and_(
+        block_period().op("&&")(period),
+        ScheduleBlock.start_at < literal(end, DateTime(timezone=True)),
+        ScheduleBlock.start_at > literal(start - BLOCK_MAX_DURATION, DateTime(timezone=True)),
+    )
+
+
+def is_overlap_violation(exc: IntegrityError) -> bool:
+    # ex_schedule_blocks_no_overlap 위반(exclusion_violation)
+    return getattr(exc.orig, "sqlstate", None) == "23P01"
+
+
+def block_insert_params(user_id: uuid.UUID, blocks: list[dict]) -> list[dict]:
+    return [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "task_id": block.get("task_id"),
+            "title": block["title"],
+            "note": block.get("note"),
+            "start_at": block["start_at"],
+            "end_at": block["end_at"],
+        }
+        for block in blocks
+    ]
+
+
+def insert_blocks_stmt():
+    # psycopg에서는 insertmanyvalues로 INSERT ... VALUES (...), (...) RETURNING 한 번에 나간다.
+    return insert(ScheduleBlock).returning(*BLOCK_OUT_COLUMNS, sort_by_parameter_order=True)
+
+
+def insert_blocks(db: Session, user_id: uuid.UUID, blocks: list[dict]) -> list[Row]:
+    if not blocks:
+        return []
+    return db.execute(insert_blocks_stmt(), block_insert_params(user_id, blocks)).all()
+
+
+def block_minutes():
+    # 블록 길이(분, 내림). Python의 int(total_seconds() / 60)와 같다.
+    return func.greatest(0, func.floor(func.extract("epoch", ScheduleBlock.end_at - ScheduleBlock.start_at) / 60)).cast(Integer)
+
+
+def overdue_tasks_stmt(user_id: uuid.UUID, start: datetime, end: datetime, now: datetime):
+    # 기간 안의 블록을 task_id별로 한 번에 집계한다. 아직 안 끝난 블록이 있는 태스크는 빼고,
+    # 지난 블록 시간을 뺀 남은 분이 있는 미완료 태스크만 돌려준다.
+    now_param = literal(now, DateTime(timezone=True))
+    progress = (
+        select(
+            ScheduleBlock.task_id,
+            func.bool_or(ScheduleBlock.end_at >= now_param).label("has_upcoming"),
+            func.coalesce(
+                func.sum(case((ScheduleBlock.end_at < now_param, block_minutes()), else_=0)), 0
+            ).label("past_minutes"),
+        )
+        .where(
+            ScheduleBlock.user_id == user_id,
+            ScheduleBlock.task_id.is_not(None),
+            overlaps_range(start, end),
+        )
+        .group_by(ScheduleBlock.task_id)
+        .subquery()
+    )
+    past_minutes = func.coalesce(progress.c.past_minutes, 0)
+    return (
+        select(
+            Task.id,
+            Task.title,
+            (Task.estimated_minutes - past_minutes).label("estimated_minutes"),
+            Task.deadline,
+            Task.importance,
+            Task.priority_tag,
+            Task.splittable,
+            Task.preferred_time,
+            Task.focus_need,
+        )
+        .outerjoin(progress, progress.c.task_id == Task.id)
+        .where(
+            Task.user_id == user_id,
+            Task.status != "done",
+            progress.c.has_upcoming.is_not(True),
+            Task.estimated_minutes - past_minutes > 0,
+        )
+        .order_by(Task.created_at, Task.id)
+    )
+
+
+def serialize_block_values(values) -> dict:
+    return {
+        "id": str(values["id"]),
+        "title": values["title"],
+        "note": values["note"],
+        "task_id": str(values["task_id"]) if values["task_id"] else None,
+        "start_at": values["start_at"],
+        "end_at": values["end_at"],
+    }
@@ -0,0 +1,67 @@
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.blocks import BLOCK_MAX_DURATION
+
+
+def _utc_iso(column: str) -> str:
+    # pydantic이 datetime을 JSON으로 내보내는 형식과 같게 만든다 (UTC, 'Z', 마이크로초는 있을 때만).
+    # 모든 필드를 UTC timestamp에서 뽑아서 세션 시간대와 상관없다.
+    utc = f"({column} AT TIME ZONE 'UTC')"
+    return (
+        f"to_char({utc}, 'YYYY-MM-DD\"T\"HH24:MI:SS')"
+        f" || CASE WHEN extract(microseconds FROM {utc})::bigint % 1000000 <> 0"
+        f" THEN to_char({utc}, '.US') ELSE '' END || 'Z'"
+    )
+
+
+_BLOCKS = f"""
+    (SELECT coalesce(json_agg(json_build_object(
+        'id', b.id, 'title', b.title, 'note', b.note, 'task_id', b.task_id,
+        'start_at', {_utc_iso('b.start_at')}, 'end_at', {_utc_iso('b.end_at')}
+    ) ORDER BY b.start_at, b.id), '[]'::json)
+    FROM schedule_blocks b
+    WHERE b.user_id = :user_id
+      AND b.start_at < :end_at
+      AND b.start_at > :start_at - interval '{BLOCK_MAX_DURATION.days} days'
+      AND tstzrange(b.start_at, b.end_at, '[)') && tstzrange(:start_at, :end_at, '[)'))::text AS blocks
+"""
+
+_FIXED_SCHEDULES = """
+    (SELECT coalesce(json_agg(json_build_object(
+        'id', f.id, 'title', f.title, 'days', f.days, 'start', f.start_time, 'end', f.end_time,
+        'category', f.category
+    ) ORDER BY f.created_at DESC), '[]'::json)
+    FROM fixed_schedules f WHERE f.user_id = :user_id)::text AS fixed_schedules
+"""
+
+_BLOCKED_TEMPLATES = """
+    (SELECT coalesce(json_agg(json_build_object(
+        'id', t.id, 'title', t.title, 'days', t.days, 'start', t.start_time, 'end', t.end_time,
+        'type', t.block_type
+    ) ORDER BY t.created_at DESC), '[]'::json)
+    FROM blocked_templates t WHERE t.user_id = :user_id)::text AS blocked_templates
+"""
+
+_SETTINGS = """
+    (SELECT row_to_json(s) FROM user_settings s WHERE s.user_id = :user_id)::text AS settings
+"""
+
+
+_REVISION = """
+    coalesce((SELECT r.revision FROM user_revisions r WHERE r.user_id = :user_id), 0) AS revision
+"""
+
+
+def _bind(sql: str):
+    return text(sql).bindparams(
+        bindparam("user_id", type_=UUID(as_uuid=True)),
+        bindparam("start_at", type_=DateTime(timezone=True)),
+        bindparam("end_at", type_=DateTime(timezone=True)),
+    )
+
+
+# Week 화면에 필요한 것을 한 문장(한 번의 왕복)으로 가져온다. 블록 JSON은 DB가 만든 그대로 응답에 붙인다.
+# 설정이 캐시에 있으면 settings 서브쿼리는 뺀다. revision은 같은 스냅샷에서 읽어서 클라이언트가 /sync?since=로 이어 받는다.
+WEEK_BUNDLE_SQL = _bind(f"SELECT {_BLOCKS}, {_FIXED_SCHEDULES}, {_BLOCKED_TEMPLATES}, {_REVISION}, {_SETTINGS}")
+WEEK_BUNDLE_NO_SETTINGS_SQL = _bind(f"SELECT {_BLOCKS}, {_FIXED_SCHEDULES}, {_BLOCKED_TEMPLATES}, {_REVISION}")
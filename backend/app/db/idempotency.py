@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import uuid
+from datetime import timedelta
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic_core import to_jsonable_python
+from sqlalchemy import Interval, String, bindparam, delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import SessionLocal
+from app.models.schedule_apply_key import ScheduleApplyKey
+
+logger = logging.getLogger(__name__)
+
+# 키를 먼저 잡는다. 같은 키를 잡은 다른 트랜잭션이 있으면 그 커밋/롤백까지 기다린다.
+# ttl이 지난 키는 새 요청이 다시 쓴다.
+CLAIM_APPLY_KEY_SQL = text(
+    """
+    INSERT INTO schedule_apply_keys (user_id, key, payload_hash)
+    VALUES (:user_id, :key, :payload_hash)
+    ON CONFLICT (user_id, key) DO UPDATE
+    SET payload_hash = EXCLUDED.payload_hash, response = NULL, created_at = now()
+    WHERE schedule_apply_keys.created_at < now() - :ttl
+    RETURNING 1
+    """
+).bindparams(
+    bindparam("user_id", type_=UUID(as_uuid=True)),
+    bindparam("key", type_=String()),
+    bindparam("payload_hash", type_=String()),
+    bindparam("ttl", type_=Interval()),
+)
+
+
+async def claim_apply_key(
+    db: AsyncSession, user_id: uuid.UUID, key: str, payload_hash: str, ttl: timedelta
+) -> Row | None:
+    # 잡았으면 None, 이미 커밋된 키면 (payload_hash, response)
+    params = {"user_id": user_id, "key": key, "payload_hash": payload_hash, "ttl": ttl}
+    if (await db.execute(CLAIM_APPLY_KEY_SQL, params)).first() is not None:
+        return None
+    stmt = select(ScheduleApplyKey.payload_hash, ScheduleApplyKey.response).where(
+        ScheduleApplyKey.user_id == user_id, ScheduleApplyKey.key == key
+    )
+    return (await db.execute(stmt)).one()
+
+
+async def store_apply_response(db: AsyncSession, user_id: uuid.UUID, key: str, response: dict) -> None:
+    # 적용과 같은 트랜잭션에서 쓴다. 커밋은 부르는 쪽이 한다.
+    await db.execute(
+        update(ScheduleApplyKey)
+        .where(ScheduleApplyKey.user_id == user_id, ScheduleApplyKey.key == key)
+        .values(response=to_jsonable_python(response))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _purge_once(ttl: timedelta) -> int:
+    db = SessionLocal()
+    try:
+        purged = db.execute(
+            delete(ScheduleApplyKey)
+            .where(ScheduleApplyKey.created_at < func.now() - ttl)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return purged
+    finally:
+        db.close()
+
+
+async def run_apply_key_purge(ttl: timedelta) -> None:
+    # ttl마다 돈다. 워커마다 돌아도 같은 결과다.
+    while True:
+        try:
+            purged = await run_in_threadpool(_purge_once, ttl)
+            if purged:
+                logger.info("purged %d schedule apply keys", purged)
+        except Exception:
+            logger.warning("schedule apply key purge failed", exc_info=True)
+        await asyncio.sleep(ttl.total_seconds())
@@ -0,0 +1,24 @@
+import base64
+import uuid
+from datetime import datetime
+
+# (정렬 시각, id) 키셋 커서. 클라이언트에는 불투명한 문자열로 준다.
+STREAM_YIELD_PER = 500
+
+
+def encode_cursor(at: datetime, row_id: uuid.UUID) -> str:
+    raw = f"{at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        at, row_id = raw.split("|", 1)
+        parsed = datetime.fromisoformat(at)
+        if parsed.tzinfo is None:
+            raise ValueError("naive cursor timestamp")
+        return parsed, uuid.UUID(row_id)
+    except ValueError as exc:
+        # binascii.Error, UnicodeDecodeError도 ValueError다.
+        raise ValueError("invalid cursor") from exc
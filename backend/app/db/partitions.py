@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import re
+from datetime import date
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# schedule_blocks는 start_at 기준 UTC 월 단위 파티션(schedule_blocks_pYYYYMM)과
+# 범위 밖 행을 받는 schedule_blocks_default로 나뉜다.
+ENSURE_PARTITIONS_SQL = text(
+    """
+    SELECT ensure_schedule_block_partitions(
+        date_trunc('month', now() AT TIME ZONE 'UTC')::date,
+        (date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => :months_ahead))::date
+    )
+    """
+)
+
+LIST_PARTITIONS_SQL = text(
+    """
+    SELECT c.relname
+    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'schedule_blocks'::regclass AND c.relname ~ '^schedule_blocks_p[0-9]{6}$'
+    ORDER BY c.relname
+    """
+)
+
+_PARTITION_RE = re.compile(r"^schedule_blocks_p(\d{4})(\d{2})$")
+
+
+def partition_name(month: date) -> str:
+    return f"schedule_blocks_p{month:%Y%m}"
+
+
+def partition_month(name: str) -> date | None:
+    match = _PARTITION_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def ensure_block_partitions(db: Session, months_ahead: int) -> int:
+    created = db.execute(ENSURE_PARTITIONS_SQL, {"months_ahead": months_ahead}).scalar_one()
+    db.commit()
+    return created
+
+
+def archive_name(name: str) -> str:
+    return name.replace("schedule_blocks_p", "schedule_blocks_archive_p", 1)
+
+
+def detach_block_partition(db: Session, name: str, archive: bool = True) -> None:
+    # 떼어 낸 파티션은 schedule_blocks_archive_pYYYYMM으로 이름을 바꿔 둔다. 원래 이름이 비어야
+    # 나중에 그 달 블록이 다시 생겼을 때 ensure_schedule_block_partitions가 파티션을 새로 만든다.
+    # 같은 달 보관 테이블이 이미 있으면 거기에 이어 붙인다. 커밋은 호출한 쪽이 한다.
+    db.execute(text(f'ALTER TABLE schedule_blocks DETACH PARTITION "{name}"'))
+    if not archive:
+        db.execute(text(f'DROP TABLE "{name}"'))
+        return
+    target = archive_name(name)
+    if db.execute(text("SELECT to_regclass(:name)"), {"name": target}).scalar() is None:
+        db.execute(text(f'ALTER TABLE "{name}" RENAME TO "{target}"'))
+    else:
+        db.execute(text(f'INSERT INTO "{target}" SELECT * FROM "{name}"'))
+        db.execute(text(f'DROP TABLE "{name}"'))
+
+
+def old_block_partitions(db: Session, before: date) -> list[str]:
+    # before가 속한 달보다 이전 달 파티션 이름 (오래된 순)
+    cutoff = before.replace(day=1)
+    names = []
+    for (name,) in db.execute(LIST_PARTITIONS_SQL).all():
+        month = partition_month(name)
+        if month is not None and month < cutoff:
+            names.append(name)
+    return names
+
+
+def detach_block_partitions_before(db: Session, before: date) -> list[str]:
+    # 보관/덤프 후 보관 테이블은 직접 지운다. 잠금은 메타데이터 변경만큼만 잡힌다.
+    detached = old_block_partitions(db, before)
+    for name in detached:
+        detach_block_partition(db, name)
+    db.commit()
+    return detached
+
+
+def _ensure_once(months_ahead: int) -> int:
+    db = SessionLocal()
+    try:
+        return ensure_block_partitions(db, months_ahead)
+    finally:
+        db.close()
+
+
+async def run_partition_maintenance(interval_seconds: float, months_ahead: int) -> None:
+    # 앞으로 months_ahead개월치 파티션을 미리 만들어 두어 새 블록이 기본 파티션에 쌓이지 않게 한다.
+    while True:
+        try:
+            created = await run_in_threadpool(_ensure_once, months_ahead)
+            if created:
+                logger.info("created %d schedule_blocks partitions", created)
+        except Exception:
+            logger.warning("schedule_blocks partition maintenance failed", exc_info=True)
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,63 @@
+import psycopg
+from psycopg.rows import namedtuple_row
+from sqlalchemy.orm import Session
+
+
+def _compile(stmt, dialect):
+    # 공개 API로 컴파일한다. IN 목록 같은 post-compile 파라미터는 SQL에 풀어 넣는다.
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    return compiled, compiled.params
+
+
+def _has_processors(stmt, compiled, dialect) -> bool:
+    # 바인드/결과 값을 SQLAlchemy가 변환해야 하는 타입(Enum, TypeDecorator 등)이 있으면
+    # psycopg에 그대로 넘길 수 없다. JSON 결과는 psycopg 다이얼렉트에서 psycopg가 직접 디코드해서
+    # 결과 변환이 없으므로 파이프라인에 들어간다.
+    for bind in compiled.binds.values():
+        if bind.type.dialect_impl(dialect).bind_processor(dialect) is not None:
+            return True
+    columns = getattr(stmt, "selected_columns", None)
+    if columns is None:
+        return True
+    return any(column.type.dialect_impl(dialect).result_processor(dialect, None) is not None for column in columns)
+
+
+def pipelinable(stmt, dialect) -> bool:
+    # fetch_pipelined가 이 문장을 파이프라인에 넣는지 (False면 Session.execute로 따로 돈다)
+    compiled, _ = _compile(stmt, dialect)
+    return not _has_processors(stmt, compiled, dialect)
+
+
+# 서로 기다릴 필요 없는 SELECT 여러 개를 psycopg 파이프라인 모드로 보낸다.
+# 쿼리마다 왕복하지 않고, 전부 보낸 뒤 한 번의 sync로 결과를 받는다.
+# 결과 행은 namedtuple이라 Row처럼 row.col / row._asdict()로 쓴다.
+# 값 변환이 필요한 문장은 파이프라인에 넣지 않고 Session.execute로 따로 돌린다.
+def fetch_pipelined(db: Session, *stmts) -> list[list]:
+    conn = db.connection()
+    raw = conn.connection.driver_connection
+    if len(stmts) < 2 or not isinstance(raw, psycopg.Connection) or not psycopg.Pipeline.is_supported():
+        return [db.execute(stmt).all() for stmt in stmts]
+
+    queries = []
+    for stmt in stmts:
+        compiled, params = _compile(stmt, conn.dialect)
+        queries.append(None if _has_processors(stmt, compiled, conn.dialect) else (compiled.string, params))
+    if sum(query is not None for query in queries) < 2:
+        # 파이프라인에 들어갈 문장이 하나 이하면 왕복이 줄지 않는다.
+        return [db.execute(stmt).all() for stmt in stmts]
+
+    cursors = {}
+    with raw.pipeline():
+        for index, query in enumerate(queries):
+            if query is not None:
+                cursor = raw.cursor(row_factory=namedtuple_row)
+                cursor.execute(*query)
+                cursors[index] = cursor
+    try:
+        return [
+            cursors[index].fetchall() if index in cursors else db.execute(stmt).all()
+            for index, stmt in enumerate(stmts)
+        ]
+    finally:
+        for cursor in cursors.values():
+            cursor.close()
@@ -0,0 +1,58 @@
+from pydantic_core import to_json
+
+from app.db.keyset import STREAM_YIELD_PER
+from app.db.session import AsyncSessionLocal
+from app.models.blocked_template import BlockedTemplate
+from app.models.fixed_schedule import FixedSchedule
+from app.models.task import Task
+
+# 목록 응답(*Out 스키마)에 필요한 컬럼만 고른다. 라벨이 곧 응답 키다.
+TASK_OUT_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.estimated_minutes,
+    Task.estimated_by_ai,
+    Task.deadline,
+    Task.importance,
+    Task.priority_tag,
+    Task.splittable,
+    Task.preferred_time,
+    Task.focus_need,
+    Task.category,
+    Task.status,
+    Task.created_at,
+)
+
+FIXED_SCHEDULE_OUT_COLUMNS = (
+    FixedSchedule.id,
+    FixedSchedule.title,
+    FixedSchedule.days,
+    FixedSchedule.start_time.label("start"),
+    FixedSchedule.end_time.label("end"),
+    FixedSchedule.category,
+)
+
+BLOCKED_TEMPLATE_OUT_COLUMNS = (
+    BlockedTemplate.id,
+    BlockedTemplate.title,
+    BlockedTemplate.days,
+    BlockedTemplate.start_time.label("start"),
+    BlockedTemplate.end_time.label("end"),
+    BlockedTemplate.block_type.label("type"),
+)
+
+
+def rows_json(rows) -> bytes:
+    # ORM 객체나 pydantic 모델을 거치지 않고 Row를 바로 JSON 바이트로 만든다.
+    # UUID/datetime은 response_model을 거칠 때와 같은 형식으로 나간다.
+    return to_json([row._asdict() for row in rows])
+
+
+async def stream_ndjson(stmt):
+    # 요청 세션은 응답 스트리밍 전에 닫힐 수 있어서 스트림 전용 세션을 연다.
+    # yield_per로 서버 사이드 커서에서 조금씩 읽어 메모리를 일정하게 유지한다.
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=STREAM_YIELD_PER))
+        async for rows in result.partitions():
+            yield b"".join(to_json(row._asdict()) + b"\n" for row in rows)
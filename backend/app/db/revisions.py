@@ -0,0 +1,27 @@
+import uuid
+
+from sqlalchemy import select
+
+from app.models.user_revision import UserRevision
+
+# 클라이언트는 매번 재검증하고(no-cache), 공유 캐시에는 남기지 않는다(private).
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+
+def user_revision_stmt(user_id: uuid.UUID):
+    return select(UserRevision.revision).where(UserRevision.user_id == user_id)
+
+
+def make_etag(user_id: uuid.UUID, revision: int | None) -> str:
+    # 같은 브라우저에서 계정이 바뀌어도 섞이지 않게 user_id를 넣는다.
+    return f'W/"{user_id.hex}.{revision or 0}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match는 약한 비교를 쓴다.
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
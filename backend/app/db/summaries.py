@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import time as clock
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Date, Integer, cast, func, literal, select, text, union_all
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.db.blocks import block_minutes
+from app.db.partitions import detach_block_partition, old_block_partitions
+from app.db.session import SessionLocal
+from app.models.block_daily_summary import BlockDailySummary
+from app.models.schedule_block import ScheduleBlock
+from app.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+# 기본 파티션에 남은 cutoff 이전 행의 달. 압축 전에 월 파티션으로 옮긴다.
+DEFAULT_OLD_MONTHS_SQL = text(
+    """
+    SELECT DISTINCT date_trunc('month', start_at AT TIME ZONE 'UTC')::date
+    FROM schedule_blocks_default
+    WHERE start_at < :cutoff
+    ORDER BY 1
+    """
+)
+
+ENSURE_MONTH_SQL = text("SELECT ensure_schedule_block_partitions(:month, :month)")
+
+# 한 달 파티션의 블록을 (유저, 시작 시각의 UTC 정시, 태스크, 카테고리)별로 묶는다. 분 계산은 block_minutes()와 같다.
+# 정시 단위로 남겨야 읽을 때 요청한 시간대의 날짜로 다시 묶을 수 있다.
+SUMMARIZE_PARTITION_SQL = """
+    INSERT INTO block_daily_summary (user_id, hour, task_id, category, minutes, block_count)
+    SELECT
+        b.user_id,
+        date_trunc('hour', b.start_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+        b.task_id,
+        t.category,
+        sum(greatest(0, floor(extract(epoch FROM b.end_at - b.start_at) / 60)))::int,
+        count(*)
+    FROM "{partition}" b
+    LEFT JOIN tasks t ON t.id = b.task_id
+    GROUP BY 1, 2, 3, 4
+    RETURNING user_id
+"""
+
+# 여러 워커가 동시에 돌면 같은 파티션을 두 번 합산할 수 있어서 파티션마다 트랜잭션 잠금을 잡고
+# 아직 붙어 있는지 다시 확인한다.
+TRY_COMPACTION_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(hashtext('compact_block_history'))")
+
+COMPACTION_LOCK_TIMEOUT = "5s"
+# 부모 테이블 ACCESS EXCLUSIVE는 NOWAIT로 이만큼 다시 시도한다.
+COMPACTION_DETACH_ATTEMPTS = 50
+COMPACTION_DETACH_RETRY_SECONDS = 0.1
+
+# 블록이 live 테이블에서 빠졌으니 리비전을 올리고 sync_floor를 맞춘다.
+# 이전 리비전으로 /sync?since= 하는 클라이언트는 410을 받고 다시 받으며, ETag도 바뀐다.
+RAISE_SYNC_FLOOR_SQL = text(
+    """
+    UPDATE user_revisions
+    SET revision = revision + 1, sync_floor = revision + 1
+    WHERE user_id = ANY(:user_ids)
+    """
+)
+LOCK_USER_REVISIONS_SQL = text(
+    "SELECT 1 FROM user_revisions WHERE user_id = ANY(:user_ids) ORDER BY user_id FOR UPDATE NOWAIT"
+)
+
+IS_ATTACHED_SQL = text(
+    """
+    SELECT EXISTS (
+        SELECT 1 FROM pg_inherits
+        WHERE inhparent = 'schedule_blocks'::regclass AND inhrelid = to_regclass(:name)
+    )
+    """
+)
+
+
+def compaction_cutoff(now: datetime, after_days: int) -> date:
+    # 파티션 경계(UTC 월 초)에 맞춘다.
+    return (now.astimezone(timezone.utc) - timedelta(days=after_days)).date().replace(day=1)
+
+
+def compacted_before(now: datetime, after_days: int | None) -> datetime | None:
+    # 이 시각 이전에 시작한 블록은 압축돼 schedule_blocks에 없을 수 있다. 압축이 꺼져 있으면 None.
+    if after_days is None:
+        return None
+    return datetime.combine(compaction_cutoff(now, after_days), time.min, tzinfo=timezone.utc)
+
+
+def _lock_for_detach(db: Session, user_ids: list[uuid.UUID]) -> bool:
+    # 부모 테이블 ACCESS EXCLUSIVE와 유저 리비전 행 잠금을 NOWAIT로 잡는다. 기다리지 않으니 이미 잡은
+    # 파티션 SHARE 잠금과 엮여 교착되지 않고, 잠금 대기 줄 앞에 서서 다른 요청을 막지도 않는다.
+    for _ in range(COMPACTION_DETACH_ATTEMPTS):
+        savepoint = db.begin_nested()
+        try:
+            db.execute(text("LOCK TABLE schedule_blocks IN ACCESS EXCLUSIVE MODE NOWAIT"))
+            db.execute(LOCK_USER_REVISIONS_SQL, {"user_ids": user_ids})
+        except OperationalError as exc:
+            savepoint.rollback()
+            if getattr(exc.orig, "sqlstate", None) != "55P03":
+                raise
+            clock.sleep(COMPACTION_DETACH_RETRY_SECONDS)
+            continue
+        savepoint.commit()
+        return True
+    return False
+
+
+def compact_block_history(db: Session, before: date, archive: bool) -> tuple[list[str], set[uuid.UUID]]:
+    # before가 속한 달 이전의 블록을 block_daily_summary로 합치고 원본 파티션을 떼어 낸다.
+    # archive면 schedule_blocks_archive_pYYYYMM으로 남기고, 아니면 지운다.
+    # (떼어 낸 파티션 이름, 블록이 합쳐진 유저)를 돌려준다.
+    # 파티션째 떼어 내므로 행 단위 트리거(tombstone/리비전)는 돌지 않는다. 대신 유저 sync_floor를 올린다.
+    cutoff = before.replace(day=1)
+    cutoff_at = datetime.combine(cutoff, time.min, tzinfo=timezone.utc)
+    db.execute(text(f"SET LOCAL lock_timeout = '{COMPACTION_LOCK_TIMEOUT}'"))
+    for (month,) in db.execute(DEFAULT_OLD_MONTHS_SQL, {"cutoff": cutoff_at}).all():
+        db.execute(ENSURE_MONTH_SQL, {"month": month})
+    db.commit()
+
+    compacted = []
+    user_ids = set()
+    for name in old_block_partitions(db, cutoff):
+        if not db.execute(TRY_COMPACTION_LOCK_SQL).scalar_one():
+            break
+        if not db.execute(IS_ATTACHED_SQL, {"name": name}).scalar_one():
+            db.commit()
+            continue
+        # 합산하는 동안은 그 파티션만 SHARE로 잠근다. 다른 달 읽기/쓰기와 이 달 읽기는 그대로 돈다.
+        db.execute(text(f"SET LOCAL lock_timeout = '{COMPACTION_LOCK_TIMEOUT}'"))
+        db.execute(text(f'LOCK TABLE "{name}" IN SHARE MODE'))
+        partition_users = set(db.execute(text(SUMMARIZE_PARTITION_SQL.format(partition=name))).scalars())
+        # DETACH/DROP 하는 짧은 동안만 부모를 ACCESS EXCLUSIVE로 잡는다.
+        if not _lock_for_detach(db, list(partition_users)):
+            db.rollback()
+            logger.info("skipped compacting %s: schedule_blocks busy", name)
+            break
+        detach_block_partition(db, name, archive)
+        if partition_users:
+            db.execute(RAISE_SYNC_FLOOR_SQL, {"user_ids": list(partition_users)})
+        db.commit()
+        compacted.append(name)
+        user_ids |= partition_users
+    return compacted, user_ids
+
+
+def local_day(column, tz_offset_minutes: int):
+    # 요청의 tz_offset_minutes(JS getTimezoneOffset, KST = -540) 기준 날짜
+    return cast(func.timezone("UTC", column) - literal(timedelta(minutes=tz_offset_minutes)), Date)
+
+
+def summary_exists_stmt(user_id: uuid.UUID, start: datetime, end: datetime):
+    return select(
+        select(BlockDailySummary.id)
+        .where(
+            BlockDailySummary.user_id == user_id,
+            BlockDailySummary.hour >= start,
+            BlockDailySummary.hour < end,
+        )
+        .exists()
+    )
+
+
+def block_activity(user_id: uuid.UUID, start: datetime, end: datetime, tz_offset_minutes: int):
+    # 기간 안의 블록 활동 (day, task_id, category, minutes, block_count).
+    # 아직 남은 블록은 시작 시각이 [start, end)인 것을 한 행씩, 압축된 기간은 정시가 [start, end)에 드는
+    # 요약 행을 합친다. 둘은 겹치지 않으니 바깥에서 GROUP BY/SUM 하면 된다.
+    # 요약은 정시 단위라 정시가 아닌 tz_offset(예: +05:30)으로는 날짜를 정확히 나눌 수 없다.
+    # 그런 요청은 라우트에서 summary_exists_stmt로 막는다.
+    raw = (
+        select(
+            local_day(ScheduleBlock.start_at, tz_offset_minutes).label("day"),
+            ScheduleBlock.task_id.label("task_id"),
+            Task.category.label("category"),
+            block_minutes().label("minutes"),
+            literal(1, Integer).label("block_count"),
+        )
+        .outerjoin(Task, Task.id == ScheduleBlock.task_id)
+        .where(
+            ScheduleBlock.user_id == user_id,
+            ScheduleBlock.start_at >= start,
+            ScheduleBlock.start_at < end,
+        )
+    )
+    summary = select(
+        local_day(BlockDailySummary.hour, tz_offset_minutes).label("day"),
+        BlockDailySummary.task_id,
+        BlockDailySummary.category,
+        BlockDailySummary.minutes,
+        BlockDailySummary.block_count,
+    ).where(
+        BlockDailySummary.user_id == user_id,
+        BlockDailySummary.hour >= start,
+        BlockDailySummary.hour < end,
+    )
+    return union_all(raw, summary).subquery("activity")
+
+
+def daily_totals_stmt(
+    user_id: uuid.UUID,
+    start: datetime,
+    end: datetime,
+    tz_offset_minutes: int,
+):
+    activity = block_activity(user_id, start, end, tz_offset_minutes)
+    return (
+        select(
+            activity.c.day,
+            func.sum(activity.c.minutes).cast(Integer).label("minutes"),
+            func.sum(activity.c.block_count).cast(Integer).label("block_count"),
+        )
+        .group_by(activity.c.day)
+        .order_by(activity.c.day)
+    )
+
+
+def _compact_once(after_days: int, archive: bool) -> tuple[list[str], set[uuid.UUID]]:
+    db = SessionLocal()
+    try:
+        before = compaction_cutoff(datetime.now(timezone.utc), after_days)
+        return compact_block_history(db, before, archive)
+    finally:
+        db.close()
+
+
+async def run_block_compaction(
+    interval_seconds: float,
+    after_days: int,
+    archive: bool,
+    on_compacted: Callable[[set[uuid.UUID]], None],
+) -> None:
+    # on_compacted는 블록이 요약으로 옮겨진 유저를 받는다 (리포트 캐시 무효화).
+    while True:
+        try:
+            compacted, user_ids = await run_in_threadpool(_compact_once, after_days, archive)
+            if compacted:
+                on_compacted(user_ids)
+                logger.info("compacted schedule_blocks partitions: %s", ", ".join(compacted))
+        except Exception:
+            logger.warning("schedule_blocks compaction failed", exc_info=True)
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.blocks import BLOCK_OUT_COLUMNS
+from app.db.reads import BLOCKED_TEMPLATE_OUT_COLUMNS, FIXED_SCHEDULE_OUT_COLUMNS, TASK_OUT_COLUMNS
+from app.db.session import SessionLocal
+from app.models.blocked_template import BlockedTemplate
+from app.models.fixed_schedule import FixedSchedule
+from app.models.schedule_block import ScheduleBlock
+from app.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+# (응답 키, 모델, 응답 컬럼). 툼스톤 entity는 테이블 이름이다.
+SYNC_ENTITIES = (
+    ("blocks", ScheduleBlock, BLOCK_OUT_COLUMNS),
+    ("tasks", Task, TASK_OUT_COLUMNS),
+    ("fixed_schedules", FixedSchedule, FIXED_SCHEDULE_OUT_COLUMNS),
+    ("blocked_templates", BlockedTemplate, BLOCKED_TEMPLATE_OUT_COLUMNS),
+)
+ENTITY_KEYS = {model.__tablename__: key for key, model, _ in SYNC_ENTITIES}
+
+# 오래된 툼스톤을 지우고, 지운 만큼 유저별 sync_floor를 올린다.
+COMPACT_TOMBSTONES_SQL = text(
+    """
+    WITH purged AS (
+        DELETE FROM sync_tombstones
+        WHERE deleted_at < now() - :retention
+        RETURNING user_id, revision
+    ), floors AS (
+        SELECT user_id, max(revision) AS floor FROM purged GROUP BY user_id
+    ), raised AS (
+        UPDATE user_revisions r
+        SET sync_floor = GREATEST(r.sync_floor, floors.floor)
+        FROM floors
+        WHERE r.user_id = floors.user_id
+    )
+    SELECT count(*) FROM purged
+    """
+)
+
+
+def compact_tombstones(db: Session, retention: timedelta) -> int:
+    purged = db.execute(COMPACT_TOMBSTONES_SQL, {"retention": retention}).scalar_one()
+    db.commit()
+    return purged
+
+
+def _compact_once(retention: timedelta) -> int:
+    db = SessionLocal()
+    try:
+        return compact_tombstones(db, retention)
+    finally:
+        db.close()
+
+
+async def run_tombstone_compaction(interval_seconds: float, retention: timedelta) -> None:
+    # 워커마다 돌아도 같은 결과라서 따로 리더를 뽑지 않는다.
+    while True:
+        try:
+            purged = await run_in_threadpool(_compact_once, retention)
+            if purged:
+                logger.info("compacted %d sync tombstones", purged)
+        except Exception:
+            logger.warning("sync tombstone compaction failed", exc_info=True)
+        await asyncio.sleep(interval_seconds)
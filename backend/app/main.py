@@ -1,9 +1,64 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
 from app.core.config import settings
+from app.core.google_auth import google_certs
+from app.db.blocks import is_overlap_violation
+from app.db.idempotency import run_apply_key_purge
+from app.db.partitions import run_partition_maintenance
+from app.db.summaries import run_block_compaction
+from app.db.sync import run_tombstone_compaction
 from app.api.routes import router
+from app.services.reports import reports
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.GOOGLE_CERTS_PREWARM:
+        await run_in_threadpool(google_certs.prewarm)
+        google_certs.start_background_refresh()
+    compaction = asyncio.create_task(
+        run_tombstone_compaction(
+            settings.SYNC_COMPACTION_INTERVAL_SECONDS,
+            timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS),
+        )
+    )
+    partitions = asyncio.create_task(
+        run_partition_maintenance(
+            settings.BLOCK_PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+            settings.BLOCK_PARTITION_MONTHS_AHEAD,
+        )
+    )
+    apply_keys = None
+    if settings.IDEMPOTENCY_TTL_SECONDS > 0:
+        apply_keys = asyncio.create_task(run_apply_key_purge(timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)))
+    history = None
+    if settings.BLOCK_COMPACTION_AFTER_DAYS is not None:
+        history = asyncio.create_task(
+            run_block_compaction(
+                settings.BLOCK_COMPACTION_INTERVAL_SECONDS,
+                settings.BLOCK_COMPACTION_AFTER_DAYS,
+                settings.BLOCK_COMPACTION_ARCHIVE,
+                reports.invalidate_users,
+            )
+        )
+    yield
+    if history is not None:
+        history.cancel()
+    if apply_keys is not None:
+        apply_keys.cancel()
+    partitions.cancel()
+    compaction.cancel()
+    google_certs.stop()
+
 
-app = FastAPI(title="TimeGrid API")
+app = FastAPI(title="TimeGrid API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,6 +66,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Blocks-Compacted-Before"],
 )
 
+
+# no-overlap 모드에서 블록이 겹치면 어느 쓰기 경로든 409로 돌려준다.
+@app.exception_handler(IntegrityError)
+async def integrity_error_handler(request: Request, exc: IntegrityError):
+    if is_overlap_violation(exc):
+        return JSONResponse(status_code=409, content={"detail": "block overlaps an existing block"})
+    raise exc
+
+
 app.include_router(router)
@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+# 압축된 옛 블록의 시간별 합계. 같은 키로 여러 행이 쌓일 수 있어서(다른 달 파티션, 나중에 채운 과거 블록)
+# 읽을 때는 항상 SUM으로 묶는다.
+class BlockDailySummary(Base):
+    __tablename__ = "block_daily_summary"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # 블록 시작 시각의 UTC 정시. 읽을 때 요청한 tz_offset의 날짜로 다시 묶는다.
+    hour: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # 태스크가 지워져도 합계는 남는다.
+    task_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    # 압축 시점의 태스크 카테고리
+    category: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    block_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+Index("ix_block_daily_summary_user_hour", BlockDailySummary.user_id, BlockDailySummary.hour)
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, String, JSON, func, Index
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, SmallInteger, String, JSON, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -22,10 +22,17 @@ class FixedSchedule(Base):
     days: Mapped[list[int]] = mapped_column(JSON, nullable=False)
     start_time: Mapped[str] = mapped_column(String(5), nullable=False)
     end_time: Mapped[str] = mapped_column(String(5), nullable=False)
+    # days/start_time/end_time을 정수로 풀어 둔 값. 쓰기 라우트가 함께 갱신한다.
+    # days_mask는 일요일=0 기준 비트(1 << day), start_min/end_min은 자정부터의 분이다.
+    days_mask: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default="0")
+    start_min: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    end_min: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
     category: Mapped[str | None] = mapped_column(String(40), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
 
 
 Index("ix_fixed_schedules_user_id", FixedSchedule.user_id)
+Index("ix_fixed_schedules_user_revision", FixedSchedule.user_id, FixedSchedule.revision)
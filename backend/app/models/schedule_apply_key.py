@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+# POST /schedule/apply의 Idempotency-Key. 적용과 같은 트랜잭션에서 쓰여서 워커가 달라도 한 번만 적용된다.
+class ScheduleApplyKey(Base):
+    __tablename__ = "schedule_apply_keys"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    payload_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # 커밋된 행에는 항상 있다. 재시도에 그대로 돌려준다.
+    response: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+Index("ix_schedule_apply_keys_created_at", ScheduleApplyKey.created_at)
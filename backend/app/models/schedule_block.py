@@ -1,13 +1,17 @@
 import uuid
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import String, Text, DateTime, ForeignKey, func, Index
+from sqlalchemy import BigInteger, Boolean, String, Text, DateTime, ForeignKey, func, Index, literal_column, false
 from datetime import datetime 
 from app.models.base import Base
 
 class ScheduleBlock(Base):
     __tablename__ = "schedule_blocks"
+    # start_at 기준 월 단위 범위 파티션. 파티션 생성은 ensure_schedule_block_partitions()가 맡는다.
+    __table_args__ = {"postgresql_partition_by": "RANGE (start_at)"}
 
+    # 테이블 PK가 (id, start_at)이라 DB는 id 하나의 유일성을 보장하지 않는다.
+    # id는 항상 서버가 uuid4로 만든다(클라이언트가 보낸 id로 만들지 않는다).
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -27,12 +31,30 @@ class ScheduleBlock(Base):
     title: Mapped[str] = mapped_column(String(120), nullable=False)
     note: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # 파티션 키는 PK에 들어가야 해서 테이블 PK는 (id, start_at)이다.
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, nullable=False)
     end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # 유저의 no_overlap 설정을 트리거가 채운다. true인 블록끼리는 trg_schedule_blocks_no_overlap이 겹침을 막는다.
+    exclusive: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=false())
+    # 마지막으로 바뀐 유저 리비전. 트리거가 채운다 (/sync 델타용).
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # ORM identity는 id 하나로 둔다. start_at을 바꿔도 같은 객체로 본다.
+    # ORM UPDATE/DELETE는 id로만 찾아서 모든 파티션을 본다. 블록을 바꿀 때는 옛 start_at을 조건에 넣은
+    # Core 문장을 쓴다 (routes의 update_block/delete_block/batch_blocks).
+    __mapper_args__ = {"primary_key": [id]}
+
 # 조회 성능용(유저별 + 시간순)
 Index("ix_schedule_blocks_user_start", ScheduleBlock.user_id, ScheduleBlock.start_at)
 Index("ix_schedule_blocks_user_task", ScheduleBlock.user_id, ScheduleBlock.task_id)
+# 구간 겹침 조회용(btree_gist 필요)
+Index(
+    "ix_schedule_blocks_user_period",
+    ScheduleBlock.user_id,
+    func.tstzrange(ScheduleBlock.start_at, ScheduleBlock.end_at, literal_column("'[)'")),
+    postgresql_using="gist",
+)
+Index("ix_schedule_blocks_user_revision", ScheduleBlock.user_id, ScheduleBlock.revision)
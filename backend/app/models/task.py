@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -33,6 +33,10 @@ class Task(Base):
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
 
 
 Index("ix_tasks_user_deadline", Task.user_id, Task.deadline)
+# GET /tasks 키셋 페이지네이션 (created_at DESC, id DESC)
+Index("ix_tasks_user_created", Task.user_id, Task.created_at, Task.id)
+Index("ix_tasks_user_revision", Task.user_id, Task.revision)
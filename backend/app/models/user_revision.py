@@ -0,0 +1,17 @@
+import uuid
+from sqlalchemy import BigInteger
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+# 유저 데이터(블록/태스크/고정 일정/차단 템플릿)가 바뀔 때마다 DB 트리거가 올린다.
+# 계정 삭제 cascade 중에도 올려야 해서 users FK는 걸지 않는다.
+class UserRevision(Base):
+    __tablename__ = "user_revisions"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # 이 리비전 이하의 툼스톤은 정리됐다. since가 이보다 작으면 전체를 다시 받아야 한다.
+    sync_floor: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func, Index
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func, Index, false
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -27,6 +27,7 @@ class UserSettings(Base):
     scheduling_density: Mapped[int] = mapped_column(Integer, nullable=False, default=60)
     preferred_time: Mapped[str] = mapped_column(String(20), nullable=False, default="any")
     auto_schedule: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    no_overlap: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
 
     focus_duration: Mapped[int] = mapped_column(Integer, nullable=False, default=45)
     break_duration: Mapped[int] = mapped_column(Integer, nullable=False, default=15)
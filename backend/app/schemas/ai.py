@@ -2,6 +2,8 @@ from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import Literal
 
+from app.schemas.schedule_block import BlockOut
+
 
 class ChatMessage(BaseModel):
     role: Literal["user", "assistant"]
@@ -98,6 +100,21 @@ class ScheduleResponse(BaseModel):
     unscheduled: list[UnscheduledTask]
 
 
+class ScheduleApplyRequest(BaseModel):
+    proposed_blocks: list[ProposedBlock] = Field(max_length=500)
+    unscheduled: list[UnscheduledTask] = []
+    # 이 시각 이후에 시작하는 해당 태스크 블록을 새 블록으로 교체한다. 기본값은 현재 시각.
+    replace_from: datetime | None = None
+    note: str | None = "AI 자동 스케줄"
+
+
+class ScheduleApplyResponse(BaseModel):
+    blocks: list[BlockOut]
+    deleted_count: int
+    scheduled_task_ids: list[str]
+    unscheduled: list[UnscheduledTask]
+
+
 class RescheduleRequest(BaseModel):
     week_start: datetime
     week_end: datetime
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel
+
+from app.schemas.blocked_template import BlockedTemplateOut
+from app.schemas.fixed_schedule import FixedScheduleOut
+from app.schemas.schedule_block import BlockOut
+from app.schemas.settings import SettingsOut
+
+
+class RecurringOccurrence(BaseModel):
+    kind: Literal["fixed", "blocked"]
+    template_id: str
+    title: str
+    category: str | None
+    start_at: datetime
+    end_at: datetime
+
+
+class CalendarMe(BaseModel):
+    id: str
+    email: str | None
+    name: str | None
+    picture: str | None
+
+
+class CalendarWeekOut(BaseModel):
+    start: datetime
+    end: datetime
+    me: CalendarMe
+    settings: SettingsOut
+    blocks: list[BlockOut]
+    fixed_schedules: list[FixedScheduleOut]
+    blocked_templates: list[BlockedTemplateOut]
+    occurrences: list[RecurringOccurrence]
+    revision: int
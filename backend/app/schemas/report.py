@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel
+
+
+class ReportItem(BaseModel):
+    # day: YYYY-MM-DD, category: 카테고리 이름, task: 태스크 id. 태스크/카테고리가 없으면 null.
+    key: str | None
+    label: str | None
+    minutes: int
+    block_count: int
+    # group_by=task일 때만
+    done: bool | None = None
+
+
+class ReportSummaryOut(BaseModel):
+    start: datetime
+    end: datetime
+    group_by: Literal["day", "category", "task"]
+    total_minutes: int
+    block_count: int
+    # 기간 안에 블록이 있는 태스크 기준
+    task_count: int
+    done_task_count: int
+    completion_rate: float
+    items: list[ReportItem]
@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Literal
 from pydantic import BaseModel, Field
 
 class BlockCreate(BaseModel):
@@ -22,3 +23,34 @@ class BlockOut(BaseModel):
     task_id: str | None
     start_at: datetime
     end_at: datetime
+
+class BlockBatchOp(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: str | None = None
+    title: str | None = Field(default=None, min_length=1, max_length=120)
+    note: str | None = None
+    task_id: str | None = None
+    start_at: datetime | None = None
+    end_at: datetime | None = None
+
+class BlockBatchRequest(BaseModel):
+    ops: list[BlockBatchOp] = Field(min_length=1, max_length=500)
+    # true면 하나라도 실패할 때 아무것도 쓰지 않는다.
+    atomic: bool = False
+
+class BlockBatchResult(BaseModel):
+    index: int
+    op: str
+    ok: bool
+    id: str | None = None
+    block: BlockOut | None = None
+    error: str | None = None
+
+class BlockBatchResponse(BaseModel):
+    committed: bool
+    results: list[BlockBatchResult]
+
+class BlockDailyOut(BaseModel):
+    day: date
+    minutes: int
+    block_count: int
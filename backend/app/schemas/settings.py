@@ -9,6 +9,7 @@ class SettingsOut(BaseModel):
     scheduling_density: int
     preferred_time: str
     auto_schedule: bool
+    no_overlap: bool
     focus_duration: int
     break_duration: int
     timer_sound: bool
@@ -27,6 +28,7 @@ class SettingsUpdate(BaseModel):
     scheduling_density: int | None = Field(default=None, ge=0, le=100)
     preferred_time: str | None = None
     auto_schedule: bool | None = None
+    no_overlap: bool | None = None
     focus_duration: int | None = None
     break_duration: int | None = None
     timer_sound: bool | None = None
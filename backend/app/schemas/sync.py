@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+
+from app.schemas.blocked_template import BlockedTemplateOut
+from app.schemas.fixed_schedule import FixedScheduleOut
+from app.schemas.schedule_block import BlockOut
+from app.schemas.task import TaskOut
+
+
+class SyncUpserts(BaseModel):
+    blocks: list[BlockOut]
+    tasks: list[TaskOut]
+    fixed_schedules: list[FixedScheduleOut]
+    blocked_templates: list[BlockedTemplateOut]
+
+
+class SyncDeletes(BaseModel):
+    blocks: list[str]
+    tasks: list[str]
+    fixed_schedules: list[str]
+    blocked_templates: list[str]
+
+
+class SyncOut(BaseModel):
+    revision: int
+    upserts: SyncUpserts
+    deletes: SyncDeletes
@@ -0,0 +1,263 @@
+import threading
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.reads import BLOCKED_TEMPLATE_OUT_COLUMNS, FIXED_SCHEDULE_OUT_COLUMNS
+from app.models.blocked_template import BlockedTemplate
+from app.models.fixed_schedule import FixedSchedule
+
+
+def day_index_sun0(target_date: date) -> int:
+    return (target_date.weekday() + 1) % 7
+
+
+def parse_minutes(value: str | None) -> int | None:
+    # 슬롯 계산용이라 "24:00"은 1440분 그대로 둔다.
+    if not value or ":" not in value:
+        return None
+    try:
+        hour, minute = (int(part) for part in value.split(":", 1))
+    except ValueError:
+        return None
+    if not (0 <= hour <= 24 and 0 <= minute < 60):
+        return None
+    return min(hour * 60 + minute, 24 * 60)
+
+
+def days_to_mask(days: Iterable[int]) -> int:
+    mask = 0
+    for day_idx in days:
+        if 0 <= day_idx <= 6:
+            mask |= 1 << day_idx
+    return mask
+
+
+def runs_on_weekday(days_mask_column, day_idx: int):
+    # SQL에서 요일로 거르는 조건 (days_mask & (1 << day) <> 0)
+    return days_mask_column.op("&")(1 << day_idx) != 0
+
+
+def recurring_columns(days: list[int], start: str, end: str) -> dict:
+    # 쓰기 라우트가 days/start/end와 함께 저장하는 정수 컬럼 값
+    return {
+        "days_mask": days_to_mask(days),
+        "start_min": parse_minutes(start) or 0,
+        "end_min": parse_minutes(end) or 0,
+    }
+
+
+def _field(item: Any, name: str) -> Any:
+    if isinstance(item, dict):
+        return item.get(name)
+    return getattr(item, name, None)
+
+
+# (kind, template_id, title, category, days_mask, start_min, end_min)
+# DB에서 읽은 정수 컬럼이 있으면 그대로 쓰고, 없으면(번들 JSON, AI 요청 스키마) 한 번만 계산한다.
+def template_rule(item: Any, kind: str) -> tuple | None:
+    mask = _field(item, "days_mask")
+    if mask is None:
+        mask = days_to_mask(_field(item, "days") or [])
+    start_min = _field(item, "start_min")
+    if start_min is None:
+        start_min = parse_minutes(_field(item, "start"))
+    end_min = _field(item, "end_min")
+    if end_min is None:
+        end_min = parse_minutes(_field(item, "end"))
+    if not mask or start_min is None or end_min is None or end_min <= start_min:
+        return None
+    template_id = _field(item, "id")
+    category = _field(item, "category") if kind == "fixed" else _field(item, "type")
+    return (
+        kind,
+        str(template_id) if template_id is not None else None,
+        _field(item, "title"),
+        category,
+        mask,
+        start_min,
+        end_min,
+    )
+
+
+def compile_rules(fixed: Iterable[Any], blocked: Iterable[Any]) -> list[tuple]:
+    rules = [template_rule(item, "fixed") for item in fixed]
+    rules.extend(template_rule(item, "blocked") for item in blocked)
+    return [rule for rule in rules if rule is not None]
+
+
+def weekly_ranges(items: Iterable[Any]) -> list[tuple[int, int, int]]:
+    # (요일 인덱스, 시작 분, 끝 분). 슬롯 단위로 일하는 스케줄러용.
+    ranges = []
+    for _, _, _, _, mask, start_min, end_min in compile_rules(items, ()):
+        for day_idx in range(7):
+            if mask >> day_idx & 1:
+                ranges.append((day_idx, start_min, end_min))
+    return ranges
+
+
+# 규칙을 start_date부터 days일 동안의 실제 시각(UTC)으로 펼친다. 요일은 일요일=0 기준이고
+# 분은 local_tz 자정부터 센다.
+def expand_rules(rules: list[tuple], start_date: date, days: int, local_tz: timezone) -> list[dict]:
+    occurrences = []
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        day_bit = 1 << day_index_sun0(day)
+        midnight = datetime(day.year, day.month, day.day, tzinfo=local_tz)
+        for kind, template_id, title, category, mask, start_min, end_min in rules:
+            if not mask & day_bit:
+                continue
+            occurrences.append(
+                {
+                    "kind": kind,
+                    "template_id": template_id,
+                    "title": title,
+                    "category": category,
+                    "start_at": (midnight + timedelta(minutes=start_min)).astimezone(timezone.utc),
+                    "end_at": (midnight + timedelta(minutes=end_min)).astimezone(timezone.utc),
+                }
+            )
+    occurrences.sort(key=lambda occ: (occ["start_at"], occ["end_at"], occ["template_id"]))
+    return occurrences
+
+
+def template_stmts(user_id: uuid.UUID) -> tuple:
+    # fetch_pipelined에 그대로 넣는다. 결과 변환이 필요한 타입을 더하면 파이프라인에서 빠진다
+    # (bench/pipeline_reads가 확인한다).
+    fixed = (
+        select(*FIXED_SCHEDULE_OUT_COLUMNS, FixedSchedule.days_mask, FixedSchedule.start_min, FixedSchedule.end_min)
+        .where(FixedSchedule.user_id == user_id)
+        .order_by(FixedSchedule.created_at.desc())
+    )
+    blocked = (
+        select(*BLOCKED_TEMPLATE_OUT_COLUMNS, BlockedTemplate.days_mask, BlockedTemplate.start_min, BlockedTemplate.end_min)
+        .where(BlockedTemplate.user_id == user_id)
+        .order_by(BlockedTemplate.created_at.desc())
+    )
+    return fixed, blocked
+
+
+def template_dicts(rows) -> list[dict]:
+    return [{**row._asdict(), "id": str(row.id)} for row in rows]
+
+
+def load_templates(db: Session, user_id: uuid.UUID) -> tuple[list[dict], list[dict]]:
+    fixed, blocked = template_stmts(user_id)
+    return template_dicts(db.execute(fixed).all()), template_dicts(db.execute(blocked).all())
+
+
+# 유저별 템플릿과 펼친 주(week)를 캐시한다. 템플릿 CRUD가 invalidate로 세대를 올리면
+# 예전 세대 항목은 더 이상 조회되지 않고 TTL/LRU로 빠진다.
+class RecurrenceService:
+    def __init__(self, ttl: float, maxsize: int):
+        self._templates = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._weeks = TTLCache(ttl=ttl, maxsize=maxsize * 4)
+        self._generations: dict[uuid.UUID, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, user_id: uuid.UUID) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._templates.pop(user_id)
+
+    def prime(self, user_id: uuid.UUID, generation: int, fixed: list[dict], blocked: list[dict]) -> tuple:
+        entry = (generation, fixed, blocked, compile_rules(fixed, blocked))
+        # 읽는 사이에 템플릿이 바뀌었으면 캐시에 넣지 않는다.
+        with self._lock:
+            if self._generations.get(user_id, 0) == generation:
+                self._templates.set(user_id, entry)
+        return entry
+
+    def prefetch_stmts(self, user_id: uuid.UUID) -> tuple[int, tuple]:
+        # 다른 쿼리와 함께 파이프라인으로 보낼 템플릿 SELECT. 캐시에 있으면 빈 튜플.
+        generation = self.generation(user_id)
+        cached = self._templates.get(user_id)
+        if cached is not None and cached[0] == generation:
+            return generation, ()
+        return generation, template_stmts(user_id)
+
+    def prime_rows(self, user_id: uuid.UUID, generation: int, rows: list[list]) -> None:
+        if rows:
+            fixed_rows, blocked_rows = rows
+            self.prime(user_id, generation, template_dicts(fixed_rows), template_dicts(blocked_rows))
+
+    def templates(self, db: Session, user_id: uuid.UUID) -> tuple[list[dict], list[dict]]:
+        _, fixed, blocked, _ = self._cached_entry(db, user_id)
+        return fixed, blocked
+
+    def occurrences(
+        self,
+        db: Session,
+        user_id: uuid.UUID,
+        start: datetime,
+        end: datetime,
+        local_tz: timezone,
+    ) -> list[dict]:
+        generation, _, _, rules = self._cached_entry(db, user_id)
+        return self._expand_range(user_id, generation, rules, start, end, local_tz)
+
+    def occurrences_for(
+        self,
+        user_id: uuid.UUID,
+        generation: int,
+        fixed: list[dict],
+        blocked: list[dict],
+        start: datetime,
+        end: datetime,
+        local_tz: timezone,
+    ) -> list[dict]:
+        # 호출한 쪽이 이미 템플릿을 읽어 온 경우 (예: /calendar/week 번들 쿼리).
+        cached = self._templates.get(user_id)
+        if cached is None or cached[0] != generation:
+            cached = self.prime(user_id, generation, fixed, blocked)
+        return self._expand_range(user_id, generation, cached[3], start, end, local_tz)
+
+    def _cached_entry(self, db: Session, user_id: uuid.UUID) -> tuple:
+        cached = self._templates.get(user_id)
+        if cached is not None:
+            return cached
+        generation = self.generation(user_id)
+        fixed, blocked = load_templates(db, user_id)
+        return self.prime(user_id, generation, fixed, blocked)
+
+    def _expand_range(
+        self,
+        user_id: uuid.UUID,
+        generation: int,
+        rules: list[tuple],
+        start: datetime,
+        end: datetime,
+        local_tz: timezone,
+    ) -> list[dict]:
+        if end <= start:
+            return []
+        offset = int(local_tz.utcoffset(None).total_seconds() // 60)
+        first_day = start.astimezone(local_tz).date()
+        last_day = end.astimezone(local_tz).date()
+        week_start = first_day - timedelta(days=day_index_sun0(first_day))
+
+        result = []
+        while week_start <= last_day:
+            key = (user_id, generation, week_start, offset)
+            week = self._weeks.get(key)
+            if week is None:
+                week = expand_rules(rules, week_start, 7, local_tz)
+                self._weeks.set(key, week)
+            result.extend(occ for occ in week if occ["start_at"] < end and occ["end_at"] > start)
+            week_start += timedelta(days=7)
+        return result
+
+
+recurrence = RecurrenceService(
+    ttl=settings.RECURRENCE_CACHE_TTL_SECONDS,
+    maxsize=settings.RECURRENCE_CACHE_MAX_USERS,
+)
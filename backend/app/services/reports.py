@@ -0,0 +1,219 @@
+import itertools
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import Integer, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.summaries import block_activity
+from app.models.task import Task
+from app.services.recurrence import day_index_sun0
+
+
+def report_rows_stmt(user_id: uuid.UUID, start: datetime, end: datetime, tz_offset_minutes: int):
+    # (날짜, 태스크, 카테고리)별 합계. 주 캐시에 넣는 단위이고, 응답은 이걸 다시 묶어서 만든다.
+    # 행 수는 블록 수가 아니라 날짜 x 태스크 수를 따른다.
+    activity = block_activity(user_id, start, end, tz_offset_minutes)
+    return (
+        select(
+            activity.c.day,
+            activity.c.task_id,
+            activity.c.category,
+            Task.title,
+            Task.status,
+            func.sum(activity.c.minutes).cast(Integer).label("minutes"),
+            func.sum(activity.c.block_count).cast(Integer).label("block_count"),
+        )
+        .outerjoin(Task, Task.id == activity.c.task_id)
+        .group_by(activity.c.day, activity.c.task_id, activity.c.category, Task.title, Task.status)
+    )
+
+
+def local_midnight(day: date, local_tz: timezone) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=local_tz)
+
+
+def week_start_of(day: date) -> date:
+    return day - timedelta(days=day_index_sun0(day))
+
+
+def summarize_rows(rows: Iterable, group_by: str, days: list[date]) -> dict:
+    total_minutes = 0
+    block_count = 0
+    groups: dict = {}
+    if group_by == "day":
+        # 빈 날짜도 0으로 채워서 기간 길이만큼 항목을 돌려준다.
+        groups = {day: {"key": day.isoformat(), "label": day.isoformat(), "minutes": 0, "block_count": 0} for day in days}
+    tasks: dict = {}
+    for row in rows:
+        total_minutes += row.minutes
+        block_count += row.block_count
+        if row.task_id is not None and row.status is not None:
+            tasks[row.task_id] = row.status == "done"
+        if group_by == "day":
+            group_key, key, label = row.day, row.day.isoformat(), row.day.isoformat()
+        elif group_by == "category":
+            group_key = key = label = row.category
+        else:
+            group_key = key = str(row.task_id) if row.task_id is not None else None
+            label = row.title
+        item = groups.get(group_key)
+        if item is None:
+            item = groups[group_key] = {"key": key, "label": label, "minutes": 0, "block_count": 0}
+            if group_by == "task":
+                item["done"] = row.status == "done" if row.status is not None else None
+        item["minutes"] += row.minutes
+        item["block_count"] += row.block_count
+
+    items = list(groups.values())
+    if group_by == "day":
+        items.sort(key=lambda item: item["key"])
+    else:
+        items.sort(key=lambda item: (-item["minutes"], item["label"] or ""))
+    done = sum(1 for is_done in tasks.values() if is_done)
+    return {
+        "total_minutes": total_minutes,
+        "block_count": block_count,
+        "task_count": len(tasks),
+        "done_task_count": done,
+        "completion_rate": round(done / len(tasks) * 100, 1) if tasks else 0.0,
+        "items": items,
+    }
+
+
+# 유저별 캐시 상태. epoch는 상태를 새로 만들 때마다 바뀌어서, 상태가 캐시에서 밀려난 뒤 남은 주 항목은
+# 다시 읽히지 않고 ttl/LRU로 사라진다.
+class _UserWeeks:
+    __slots__ = ("epoch", "generation", "keys")
+
+    def __init__(self, epoch: int):
+        self.epoch = epoch
+        self.generation = 0
+        self.keys: set[tuple[int, date]] = set()
+
+
+# (유저, tz, 주 시작 일요일)별 report_rows 결과를 캐시한다. 블록을 쓰면 그 블록 시작 시각이 든 주만
+# 지우고, 태스크를 바꾸면(카테고리/제목/상태) 그 유저 주를 모두 지운다.
+# 유저별 상태도 TTLCache에 둬서 유저 수만큼 쌓이지 않는다.
+class ReportService:
+    def __init__(self, ttl: float, maxsize: int):
+        self._weeks = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._users = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._epochs = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _state(self, user_id: uuid.UUID) -> _UserWeeks:
+        # self._lock 안에서 부른다. 쓸 때마다 ttl을 늘린다.
+        state = self._users.get(user_id)
+        if state is None:
+            state = _UserWeeks(next(self._epochs))
+        self._users.set(user_id, state)
+        return state
+
+    def snapshot(self, user_id: uuid.UUID) -> tuple[int, int]:
+        with self._lock:
+            state = self._state(user_id)
+            return state.epoch, state.generation
+
+    def invalidate(self, user_id: uuid.UUID, instants: Iterable[datetime] | None = None) -> None:
+        # instants가 None이면 유저의 모든 주를 지운다.
+        with self._lock:
+            state = self._users.get(user_id)
+            if state is None:
+                # 상태가 없으면 읽을 수 있는 주도 없고, 읽는 중인 요청은 store에서 epoch가 달라 버린다.
+                return
+            state.generation += 1
+            if not state.keys:
+                return
+            if instants is None:
+                stale = set(state.keys)
+            else:
+                instants = list(instants)
+                stale = set()
+                for tz_offset, week_start in state.keys:
+                    local_tz = timezone(timedelta(minutes=-tz_offset))
+                    for instant in instants:
+                        if week_start_of(instant.astimezone(local_tz).date()) == week_start:
+                            stale.add((tz_offset, week_start))
+                            break
+            for tz_offset, week_start in stale:
+                self._weeks.pop((user_id, state.epoch, tz_offset, week_start))
+            state.keys -= stale
+
+    def invalidate_users(self, user_ids: Iterable[uuid.UUID]) -> None:
+        for user_id in user_ids:
+            self.invalidate(user_id)
+
+    async def rows(
+        self,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        start: datetime,
+        end: datetime,
+        tz_offset: int,
+    ) -> tuple[list, list[date]]:
+        # (report_rows 행, 기간의 날짜들). 경계가 로컬 자정이면 주 캐시를 쓰고, 빠진 주만 한 번에 읽는다.
+        local_tz = timezone(timedelta(minutes=-tz_offset))
+        first = start.astimezone(local_tz)
+        last = end.astimezone(local_tz)
+        last_day = (last - timedelta(microseconds=1)).date()
+        days = [first.date() + timedelta(days=i) for i in range((last_day - first.date()).days + 1)]
+        if first.time() != time.min or last.time() != time.min:
+            return (await db.execute(report_rows_stmt(user_id, start, end, tz_offset))).all(), days
+
+        week_starts = []
+        week_start = week_start_of(first.date())
+        while week_start <= last_day:
+            week_starts.append(week_start)
+            week_start += timedelta(days=7)
+        epoch, generation = self.snapshot(user_id)
+        found = self.cached_weeks(user_id, epoch, tz_offset, week_starts)
+        missing = [week_start for week_start in week_starts if week_start not in found]
+        if missing:
+            fetched = {week_start: [] for week_start in missing}
+            stmt = report_rows_stmt(
+                user_id,
+                local_midnight(missing[0], local_tz),
+                local_midnight(missing[-1] + timedelta(days=7), local_tz),
+                tz_offset,
+            )
+            for row in (await db.execute(stmt)).all():
+                week_rows = fetched.get(week_start_of(row.day))
+                if week_rows is not None:
+                    week_rows.append(row)
+            self.store(user_id, epoch, generation, tz_offset, fetched)
+            found.update(fetched)
+        return [
+            row
+            for week_start in week_starts
+            for row in found[week_start]
+            if first.date() <= row.day <= last_day
+        ], days
+
+    def cached_weeks(self, user_id: uuid.UUID, epoch: int, tz_offset: int, week_starts: list[date]) -> dict[date, list]:
+        found = {}
+        for week_start in week_starts:
+            rows = self._weeks.get((user_id, epoch, tz_offset, week_start))
+            if rows is not None:
+                found[week_start] = rows
+        return found
+
+    def store(self, user_id: uuid.UUID, epoch: int, generation: int, tz_offset: int, weeks: dict[date, list]) -> None:
+        # 읽는 사이에 블록/태스크가 바뀌었거나 상태가 밀려났으면 캐시에 넣지 않는다.
+        with self._lock:
+            state = self._users.get(user_id)
+            if state is None or state.epoch != epoch or state.generation != generation:
+                return
+            for week_start, rows in weeks.items():
+                self._weeks.set((user_id, epoch, tz_offset, week_start), rows)
+                state.keys.add((tz_offset, week_start))
+
+
+reports = ReportService(
+    ttl=settings.REPORT_CACHE_TTL_SECONDS,
+    maxsize=settings.REPORT_CACHE_MAX_WEEKS,
+)
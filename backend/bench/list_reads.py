@@ -0,0 +1,126 @@
+"""GET /blocks 읽기 경로의 행당 비용 비교.
+
+before: ORM 엔티티 로드 -> dict 변환 -> response_model 검증/직렬화
+after:  컬럼만 고른 Core Row -> JSON 바이트
+
+DATABASE_URL의 DB에 임시 유저와 블록을 만들고 끝나면 지운다.
+
+    cd backend && python -m bench.list_reads --rows 5000 --repeat 20
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, select
+
+from app.db.blocks import BLOCK_OUT_COLUMNS, overlaps_range
+from app.db.reads import rows_json
+from app.db.session import SessionLocal
+from app.models.schedule_block import ScheduleBlock
+from app.models.user import User
+from app.schemas.schedule_block import BlockOut
+
+BLOCK_LIST = TypeAdapter(list[BlockOut])
+
+
+def before(db, user_id, start, end) -> bytes:
+    stmt = (
+        select(ScheduleBlock)
+        .where(ScheduleBlock.user_id == user_id, overlaps_range(start, end))
+        .order_by(ScheduleBlock.start_at.asc(), ScheduleBlock.id.asc())
+    )
+    blocks = db.execute(stmt).scalars().all()
+    data = [
+        {
+            "id": str(b.id),
+            "title": b.title,
+            "note": b.note,
+            "task_id": str(b.task_id) if b.task_id else None,
+            "start_at": b.start_at,
+            "end_at": b.end_at,
+        }
+        for b in blocks
+    ]
+    # FastAPI가 response_model로 하는 일: 검증 -> json 모드 덤프 -> json.dumps
+    validated = BLOCK_LIST.validate_python(data)
+    payload = jsonable_encoder(BLOCK_LIST.dump_python(validated, mode="json"))
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def after(db, user_id, start, end) -> bytes:
+    stmt = (
+        select(*BLOCK_OUT_COLUMNS)
+        .where(ScheduleBlock.user_id == user_id, overlaps_range(start, end))
+        .order_by(ScheduleBlock.start_at.asc(), ScheduleBlock.id.asc())
+    )
+    return rows_json(db.execute(stmt).all())
+
+
+def measure(fn, repeat: int, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            fn(db, *args)
+            best = min(best, time.perf_counter() - started)
+        finally:
+            db.close()
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    user_id = uuid.uuid4()
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    db = SessionLocal()
+    try:
+        db.add(User(id=user_id, google_sub=f"bench-{user_id}", email=f"{user_id}@bench.local", name="bench"))
+        db.flush()
+        db.execute(
+            insert(ScheduleBlock),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "title": f"block {i}",
+                    "note": None,
+                    "start_at": start + timedelta(minutes=30 * i),
+                    "end_at": start + timedelta(minutes=30 * i + 25),
+                }
+                for i in range(args.rows)
+            ],
+        )
+        db.commit()
+        end = start + timedelta(minutes=30 * args.rows)
+
+        check = SessionLocal()
+        try:
+            assert json.loads(before(check, user_id, start, end)) == json.loads(after(check, user_id, start, end))
+        finally:
+            check.close()
+
+        results = {
+            "before": measure(before, args.repeat, user_id, start, end),
+            "after": measure(after, args.repeat, user_id, start, end),
+        }
+        for name, seconds in results.items():
+            print(f"{name:>6}: {seconds * 1000:8.2f} ms total, {seconds / args.rows * 1e6:6.2f} us/row")
+        print(f"speedup: {results['before'] / results['after']:.2f}x ({args.rows} rows, best of {args.repeat})")
+    finally:
+        db.rollback()
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
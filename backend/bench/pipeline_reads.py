@@ -0,0 +1,192 @@
+"""ai_reschedule 읽기 단계의 DB 왕복 비교.
+
+before: 독립 SELECT 4개(태스크 집계, 블록, 고정 일정, 차단 템플릿)를 차례로 실행
+after:  fetch_pipelined로 psycopg 파이프라인 모드에서 한 번에 전송
+
+실제로 파이프라인에 들어간 문장 수를 함께 출력한다. 4개 모두 들어가지 않으면 실패한다.
+
+로컬 DB는 왕복이 거의 0이라, 앞에 지연 프록시(--rtt-ms, 왕복 기준)를 두고 측정한다.
+DATABASE_URL의 DB에 임시 유저와 데이터를 만들고 끝나면 지운다.
+
+    cd backend && python -m bench.pipeline_reads --rtt-ms 0.5 2 10 --repeat 30
+"""
+import argparse
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.blocks import overdue_tasks_stmt, overlaps_range
+from app.db.pipeline import fetch_pipelined, pipelinable
+from app.db.session import SessionLocal
+from app.models.blocked_template import BlockedTemplate
+from app.models.fixed_schedule import FixedSchedule
+from app.models.schedule_block import ScheduleBlock
+from app.models.task import Task
+from app.models.user import User
+from app.services.recurrence import template_stmts
+
+
+# 양방향으로 rtt/2씩 늦게 전달하는 TCP 프록시. 대역폭은 건드리지 않는다.
+class LatencyProxy:
+    def __init__(self, upstream_host: str, upstream_port: int, rtt: float):
+        self.upstream = (upstream_host, upstream_port)
+        self.delay = rtt / 2
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    async def _pump(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while data := await reader.read(65536):
+                loop.call_later(self.delay, writer.write, data)
+        finally:
+            loop.call_later(self.delay, writer.close)
+
+    async def _handle(self, client_reader, client_writer):
+        upstream_reader, upstream_writer = await asyncio.open_connection(*self.upstream)
+        await asyncio.gather(
+            self._pump(client_reader, upstream_writer),
+            self._pump(upstream_reader, client_writer),
+            return_exceptions=True,
+        )
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    def start(self) -> int:
+        self._thread.start()
+        self._ready.wait()
+        return self.port
+
+
+def reschedule_stmts(user_id, start, end, now):
+    return [
+        overdue_tasks_stmt(user_id, start, end, now),
+        select(ScheduleBlock.start_at, ScheduleBlock.end_at).where(
+            ScheduleBlock.user_id == user_id, overlaps_range(start, end)
+        ),
+        *template_stmts(user_id),
+    ]
+
+
+def before(db, stmts):
+    return [db.execute(stmt).all() for stmt in stmts]
+
+
+def after(db, stmts):
+    return fetch_pipelined(db, *stmts)
+
+
+def measure(session_factory, fn, repeat: int, stmts) -> float:
+    samples = []
+    with session_factory() as db:
+        # 커넥션/트랜잭션 시작 비용은 빼고 읽기만 잰다.
+        db.connection()
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn(db, stmts)
+            samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def seed(db, user_id, start):
+    db.add(User(id=user_id, google_sub=f"bench-{user_id}", email=f"{user_id}@bench.local", name="bench"))
+    db.flush()
+    task_ids = [uuid.uuid4() for _ in range(40)]
+    db.execute(
+        insert(Task),
+        [
+            {
+                "id": task_id,
+                "user_id": user_id,
+                "title": f"task {i}",
+                "estimated_minutes": 120,
+                "importance": 3,
+                "deadline": start + timedelta(days=10),
+            }
+            for i, task_id in enumerate(task_ids)
+        ],
+    )
+    db.execute(
+        insert(ScheduleBlock),
+        [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "task_id": task_ids[i % len(task_ids)],
+                "title": f"block {i}",
+                "start_at": start + timedelta(minutes=45 * i),
+                "end_at": start + timedelta(minutes=45 * i + 30),
+            }
+            for i in range(200)
+        ],
+    )
+    for i in range(5):
+        db.add(FixedSchedule(user_id=user_id, title=f"class {i}", days=[1, 3], start_time="09:00", end_time="10:30"))
+        db.add(BlockedTemplate(user_id=user_id, title=f"block {i}", days=[0, 6], start_time="00:00", end_time="07:00"))
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rtt-ms", type=float, nargs="+", default=[0.5, 2.0, 10.0])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    user_id = uuid.uuid4()
+    start = datetime(2030, 1, 6, tzinfo=timezone.utc)
+    end = start + timedelta(days=7)
+    now = start + timedelta(days=3)
+    url = make_url(settings.DATABASE_URL)
+    db = SessionLocal()
+    try:
+        seed(db, user_id, start)
+        stmts = reschedule_stmts(user_id, start, end, now)
+        pipelined = sum(pipelinable(stmt, db.get_bind().dialect) for stmt in stmts)
+        assert pipelined == len(stmts), f"only {pipelined}/{len(stmts)} statements are pipelined"
+
+        check = SessionLocal()
+        try:
+            expected = [[row._asdict() for row in rows] for rows in before(check, stmts)]
+            got = [[row._asdict() for row in rows] for rows in after(check, stmts)]
+            assert expected == got
+        finally:
+            check.close()
+
+        for rtt_ms in args.rtt_ms:
+            proxy = LatencyProxy(url.host or "localhost", url.port or 5432, rtt_ms / 1000)
+            port = proxy.start()
+            engine = create_engine(url.set(host="127.0.0.1", port=port))
+            factory = sessionmaker(bind=engine)
+            try:
+                seq = measure(factory, before, args.repeat, stmts)
+                pipe = measure(factory, after, args.repeat, stmts)
+            finally:
+                engine.dispose()
+            print(
+                f"rtt {rtt_ms:5.1f} ms: sequential {seq * 1000:7.2f} ms, pipelined {pipe * 1000:7.2f} ms"
+                f" ({seq / pipe:.2f}x, {pipelined}/{len(stmts)} queries pipelined, median of {args.repeat})"
+            )
+    finally:
+        db.rollback()
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
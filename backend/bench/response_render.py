@@ -0,0 +1,84 @@
+"""response_model이 붙은 라우트의 응답 렌더링 비용 비교 (DB 없이 프로세스 안에서).
+
+before: FastAPI 기본 (검증 -> dump_python -> json.dumps)
+after:  model_response (TypeAdapter 검증 -> dump_json)
+
+    cd backend && python -m bench.response_render --rows 500 --requests 200
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.responses import model_response
+from app.schemas.task import TaskOut
+
+
+def make_rows(count: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"task {i}",
+            "description": None,
+            "estimated_minutes": 60,
+            "estimated_by_ai": False,
+            "deadline": now + timedelta(days=i % 14),
+            "importance": 3,
+            "priority_tag": "medium",
+            "splittable": True,
+            "preferred_time": "any",
+            "focus_need": "medium",
+            "category": None,
+            "status": "pending",
+            "created_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def make_client(rows: list[dict], fast: bool) -> TestClient:
+    router = APIRouter()
+
+    @router.get("/tasks", response_model=list[TaskOut])
+    async def list_tasks():
+        if fast:
+            return model_response(list[TaskOut], rows)
+        return rows
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def measure(client: TestClient, requests: int) -> float:
+    client.get("/tasks")
+    # 벽시계 대신 프로세스 CPU 시간으로 잰다.
+    started = time.process_time()
+    for _ in range(requests):
+        client.get("/tasks")
+    return (time.process_time() - started) / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    before = make_client(rows, fast=False)
+    after = make_client(rows, fast=True)
+    assert before.get("/tasks").json() == after.get("/tasks").json()
+
+    results = {"before": measure(before, args.requests), "after": measure(after, args.requests)}
+    for name, seconds in results.items():
+        print(f"{name:>6}: {seconds * 1000:7.2f} ms CPU/request, {seconds / args.rows * 1e6:6.2f} us/row")
+    print(f"speedup: {results['before'] / results['after']:.2f}x ({args.rows} rows x {args.requests} requests)")
+
+
+if __name__ == "__main__":
+    main()
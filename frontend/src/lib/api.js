@@ -1,6 +1,6 @@
 const BASE = import.meta.env.VITE_API_BASE_URL;
 
-export async function api(path, options = {}) {
+async function request(path, options = {}) {
   const res = await fetch(`${BASE}${path}`, {
     ...options,
     credentials: "include",
@@ -14,5 +14,16 @@ export async function api(path, options = {}) {
   const data = text ? (() => { try { return JSON.parse(text); } catch { return text; } })() : null;
 
   if (!res.ok) throw new Error(typeof data === "string" ? data : JSON.stringify(data));
-  return data;
+  return { data, res };
+}
+
+export async function api(path, options = {}) {
+  return (await request(path, options)).data;
+}
+
+// 목록 응답과 함께 ETag(W/"<user>.<revision>")의 리비전을 돌려준다. 없으면 null.
+export async function apiWithRevision(path, options = {}) {
+  const { data, res } = await request(path, options);
+  const match = /\.(\d+)"$/.exec(res.headers.get("ETag") || "");
+  return { data, revision: match ? Number(match[1]) : null };
 }
@@ -0,0 +1,20 @@
+const BASE = import.meta.env.VITE_API_BASE_URL;
+
+// 서버가 보내는 변경 알림(SSE)을 구독한다. 반환값을 호출하면 연결을 닫는다.
+// onChange(entities, revision): revision은 변경이 커밋된 유저 리비전이다.
+export function subscribeChanges(onChange) {
+  const source = new EventSource(`${BASE}/events`, { withCredentials: true });
+  const handler = (event) => {
+    try {
+      const data = JSON.parse(event.data);
+      onChange(data.entities || [], data.revision || 0);
+    } catch {
+      // 형식이 깨진 알림은 무시한다.
+    }
+  };
+  source.addEventListener("change", handler);
+  return () => {
+    source.removeEventListener("change", handler);
+    source.close();
+  };
+}
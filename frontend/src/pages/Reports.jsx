@@ -28,8 +28,8 @@ const formatWeekRange = (weekStart) => {
 
 export default function Reports() {
   const { settings } = useSettings();
-  const [blocks, setBlocks] = useState([]);
-  const [tasks, setTasks] = useState([]);
+  const [daily, setDaily] = useState(null);
+  const [categories, setCategories] = useState([]);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -37,16 +37,18 @@ export default function Reports() {
       setLoading(true);
       const weekStart = startOfWeek(new Date(), settings.week_start_day);
       const weekEnd = addDays(weekStart, 7);
+      // 합계는 서버에서 집계한다. 응답 크기는 블록 수와 상관없다.
+      const query = `from_=${encodeURIComponent(weekStart.toISOString())}&to=${encodeURIComponent(weekEnd.toISOString())}&tz_offset_minutes=${weekStart.getTimezoneOffset()}`;
       try {
-        const [list, taskRows] = await Promise.all([
-          api(`/blocks?from_=${encodeURIComponent(weekStart.toISOString())}&to=${encodeURIComponent(weekEnd.toISOString())}`),
-          api("/tasks"),
+        const [byDay, byCategory] = await Promise.all([
+          api(`/reports/summary?${query}&group_by=day`),
+          api(`/reports/summary?${query}&group_by=category`),
         ]);
-        setBlocks(list);
-        setTasks(taskRows);
+        setDaily(byDay);
+        setCategories(byCategory.items);
       } catch {
-        setBlocks([]);
-        setTasks([]);
+        setDaily(null);
+        setCategories([]);
       } finally {
         setLoading(false);
       }
@@ -54,32 +56,17 @@ export default function Reports() {
     load();
   }, [settings.week_start_day]);
 
-  const weeklyMinutes = useMemo(() => {
-    return blocks.reduce((sum, block) => {
-      const start = new Date(block.start_at);
-      const end = new Date(block.end_at);
-      return sum + Math.max(0, (end - start) / 60000);
-    }, 0);
-  }, [blocks]);
-
   const weekStart = useMemo(() => startOfWeek(new Date(), settings.week_start_day), [settings.week_start_day]);
+  const weeklyMinutes = daily?.total_minutes ?? 0;
   const dailyMinutes = useMemo(() => {
     const minutes = Array.from({ length: 7 }, () => 0);
-    const msPerDay = 24 * 60 * 60 * 1000;
-    blocks.forEach((block) => {
-      const start = new Date(block.start_at);
-      const end = new Date(block.end_at);
-      const dayIndex = Math.floor((start.getTime() - weekStart.getTime()) / msPerDay);
-      if (dayIndex >= 0 && dayIndex < 7) {
-        minutes[dayIndex] += Math.max(0, (end - start) / 60000);
-      }
+    (daily?.items || []).slice(0, 7).forEach((item, idx) => {
+      minutes[idx] = item.minutes;
     });
     return minutes;
-  }, [blocks, weekStart]);
+  }, [daily]);
 
-  const totalTasks = tasks.length;
-  const doneTasks = tasks.filter((t) => t.status === "done").length;
-  const completionRate = totalTasks ? Math.round((doneTasks / totalTasks) * 1000) / 10 : 0;
+  const completionRate = daily?.completion_rate ?? 0;
 
   const maxMinutes = Math.max(...dailyMinutes, 1);
   const dayLabels = settings.week_start_day === "monday"
@@ -150,22 +137,12 @@ export default function Reports() {
             <button style={styles.linkButton}>상세 보기</button>
           </div>
           <div style={styles.categoryGrid}>
-            <div style={styles.categoryItem}>
-              <span>개발</span>
-              <strong>18.4h</strong>
-            </div>
-            <div style={styles.categoryItem}>
-              <span>공부</span>
-              <strong>12.1h</strong>
-            </div>
-            <div style={styles.categoryItem}>
-              <span>회의</span>
-              <strong>6.2h</strong>
-            </div>
-            <div style={styles.categoryItem}>
-              <span>개인</span>
-              <strong>5.8h</strong>
-            </div>
+            {categories.slice(0, 4).map((item) => (
+              <div key={item.key ?? "none"} style={styles.categoryItem}>
+                <span>{item.label ?? "미분류"}</span>
+                <strong>{(item.minutes / 60).toFixed(1)}h</strong>
+              </div>
+            ))}
           </div>
         </section>
       </main>
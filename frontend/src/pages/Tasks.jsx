@@ -128,6 +128,8 @@ export default function Tasks() {
   const [applying, setApplying] = useState(false);
   const [notice, setNotice] = useState("");
   const [proposedBlocks, setProposedBlocks] = useState([]);
+  // 제안된 스케줄 하나당 키 하나. 실패 후 다시 적용할 때도 같은 키를 보내서 서버가 중복 적용을 막는다.
+  const [applyKey, setApplyKey] = useState(null);
   const [unscheduled, setUnscheduled] = useState([]);
   const rescheduleCheckedRef = useRef(false);
 
@@ -304,13 +306,12 @@ export default function Tasks() {
       );
       const related = blocks.filter((block) => block.task_id === task.id);
       if (related.length > 0) {
-        await Promise.all(
-          related.map((block) =>
-            api(`/blocks/${block.id}`, {
-              method: "DELETE",
-            }),
-          ),
-        );
+        await api("/blocks/batch", {
+          method: "POST",
+          body: JSON.stringify({
+            ops: related.map((block) => ({ op: "delete", id: block.id })),
+          }),
+        });
       }
       await api(`/tasks/${task.id}`, {
         method: "PATCH",
@@ -390,12 +391,15 @@ export default function Tasks() {
         setLoading(false);
         return;
       }
+      const key = crypto.randomUUID();
+      // 자동 적용이 실패해도 미리보기로 남겨서 같은 키로 다시 적용할 수 있게 한다.
+      setProposedBlocks(proposed);
+      setUnscheduled(unscheduled);
+      setApplyKey(key);
       if (autoApply) {
-        await applyScheduleBlocks(proposed, unscheduled);
+        await applyScheduleBlocks(proposed, unscheduled, key);
         return;
       }
-      setProposedBlocks(proposed);
-      setUnscheduled(unscheduled);
       if (unscheduled.length > 0) {
         setNotice("일부 태스크는 시간 부족으로 배치되지 않았어요. 미리보기를 확인하세요.");
       }
@@ -406,40 +410,31 @@ export default function Tasks() {
     }
   };
 
-  const applyScheduleBlocks = async (blocksToApply, unscheduledList = []) => {
+  const applyScheduleBlocks = async (blocksToApply, unscheduledList, key) => {
     if (blocksToApply.length === 0 || applying) return;
     const hasUnscheduled = unscheduledList.length > 0;
     setApplying(true);
     setNotice("");
     try {
-      await Promise.all(
-        blocksToApply.map((block) =>
-          api("/blocks", {
-            method: "POST",
-            body: JSON.stringify({
-              title: block.title,
-              note: "AI 자동 스케줄",
-              task_id: block.taskId,
-              start_at: block.start_at,
-              end_at: block.end_at,
-            }),
-          }),
-        ),
-      );
-
-      const scheduledIds = new Set(blocksToApply.map((b) => b.taskId));
-      await Promise.all(
-        Array.from(scheduledIds).map((taskId) =>
-          api(`/tasks/${taskId}`, {
-            method: "PATCH",
-            body: JSON.stringify({ status: "scheduled" }),
-          }),
-        ),
-      );
+      await api("/schedule/apply", {
+        method: "POST",
+        headers: { "Idempotency-Key": key },
+        body: JSON.stringify({
+          proposed_blocks: blocksToApply.map((block) => ({
+            task_id: block.taskId,
+            title: block.title,
+            start_at: block.start_at,
+            end_at: block.end_at,
+          })),
+          unscheduled: unscheduledList,
+          note: "AI 자동 스케줄",
+        }),
+      });
 
       await loadData();
       setProposedBlocks([]);
       setUnscheduled([]);
+      setApplyKey(null);
       if (hasUnscheduled) {
         setNotice("일부 태스크는 시간 부족으로 배치되지 않았어요.");
       } else {
@@ -454,12 +449,13 @@ export default function Tasks() {
 
   const applySchedule = async () => {
     if (proposedBlocks.length === 0 || applying) return;
-    await applyScheduleBlocks(proposedBlocks, unscheduled);
+    await applyScheduleBlocks(proposedBlocks, unscheduled, applyKey);
   };
 
   const clearPreview = () => {
     setProposedBlocks([]);
     setUnscheduled([]);
+    setApplyKey(null);
   };
 
   return (
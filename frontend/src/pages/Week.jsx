@@ -1,7 +1,8 @@
 import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import { useLocation, useNavigate } from "react-router-dom";
 import Sidebar from "../components/Sidebar";
-import { api } from "../lib/api";
+import { api, apiWithRevision } from "../lib/api";
+import { subscribeChanges } from "../lib/events";
 import BlockModal from "../components/BlockModal";
 import { useSettings } from "../lib/useSettings";
 
@@ -178,6 +179,7 @@ export default function Week() {
   const { settings } = useSettings();
   const [me, setMe] = useState(null);
   const [blocks, setBlocks] = useState([]);
+  const revisionRef = useRef(null); // 화면 블록이 반영한 유저 리비전 (/sync?since=)
   const [fixedSchedules, setFixedSchedules] = useState([]);
   const [blockedTemplates, setBlockedTemplates] = useState([]);
   const [err, setErr] = useState("");
@@ -290,6 +292,22 @@ export default function Week() {
 
   const load = async () => {
     setErr("");
+    if (activeView === "week") {
+      // 주간 화면은 블록/반복 일정/설정을 한 번에 받는다.
+      try {
+        const bundle = await api(
+          `/calendar/week?start=${encodeURIComponent(rangeStart.toISOString())}&tz_offset_minutes=${rangeStart.getTimezoneOffset()}`,
+        );
+        setMe(bundle.me);
+        setBlocks(bundle.blocks);
+        setFixedSchedules(bundle.fixed_schedules);
+        setBlockedTemplates(bundle.blocked_templates);
+        revisionRef.current = bundle.revision;
+        return;
+      } catch {
+        // 실패하면 아래 개별 요청으로 다시 시도한다 (세션 만료 처리 포함).
+      }
+    }
     try {
       const meRes = await api("/me");
       setMe(meRes);
@@ -302,14 +320,15 @@ export default function Week() {
     const to = rangeEnd.toISOString();
     try {
       const results = await Promise.allSettled([
-        api(`/blocks?from_=${encodeURIComponent(from_)}&to=${encodeURIComponent(to)}`),
+        apiWithRevision(`/blocks?from_=${encodeURIComponent(from_)}&to=${encodeURIComponent(to)}`),
         api("/fixed-schedules"),
         api("/blocked-templates"),
       ]);
 
       const [blocksResult, fixedResult, blockedResult] = results;
       if (blocksResult.status === "fulfilled") {
-        setBlocks(blocksResult.value);
+        setBlocks(blocksResult.value.data);
+        revisionRef.current = blocksResult.value.revision;
       } else {
         setErr("타임테이블 데이터를 불러오지 못했어요.");
       }
@@ -331,6 +350,74 @@ export default function Week() {
   };
 
   useEffect(() => { load(); }, [rangeStart.getTime(), rangeEnd.getTime()]); // 뷰 이동 시 reload
+  const loadRef = useRef(load);
+  loadRef.current = load;
+  const rangeRef = useRef({ start: rangeStart, end: rangeEnd });
+  rangeRef.current = { start: rangeStart, end: rangeEnd };
+
+  // 화면에 반영된 리비전 이후의 변경만 /sync로 받아 블록 목록에 합친다.
+  // 리비전을 모르거나(410 포함) 반복 일정이 바뀌었으면 전체를 다시 불러온다.
+  const syncOnce = async () => {
+    const since = revisionRef.current;
+    if (since == null) {
+      await loadRef.current();
+      return;
+    }
+    let res;
+    try {
+      res = await api(`/sync?since=${since}`);
+    } catch {
+      await loadRef.current();
+      return;
+    }
+    if (revisionRef.current !== since || res.revision <= since) return; // 그 사이 load()가 새로 받았다.
+    const { upserts, deletes } = res;
+    if (
+      upserts.fixed_schedules.length || deletes.fixed_schedules.length
+      || upserts.blocked_templates.length || deletes.blocked_templates.length
+    ) {
+      await loadRef.current();
+      return;
+    }
+    const start = rangeRef.current.start.getTime();
+    const end = rangeRef.current.end.getTime();
+    const drop = new Set([...deletes.blocks, ...upserts.blocks.map((b) => b.id)]);
+    const added = upserts.blocks.filter(
+      (b) => new Date(b.start_at).getTime() < end && new Date(b.end_at).getTime() > start,
+    );
+    setBlocks((prev) => [...prev.filter((b) => !drop.has(b.id)), ...added]
+      .sort((a, b) => new Date(a.start_at) - new Date(b.start_at)));
+    revisionRef.current = res.revision;
+  };
+  // 동시에 들어온 요청은 진행 중인 sync 뒤에 한 번 더 돌려서 합친다.
+  const syncingRef = useRef(null);
+  const pull = () => {
+    if (syncingRef.current) {
+      syncingRef.current.again = true;
+      return syncingRef.current.promise;
+    }
+    const state = { again: false };
+    state.promise = (async () => {
+      try {
+        do {
+          state.again = false;
+          await syncOnce();
+        } while (state.again);
+      } finally {
+        syncingRef.current = null;
+      }
+    })();
+    syncingRef.current = state;
+    return state.promise;
+  };
+  const pullRef = useRef(pull);
+  pullRef.current = pull;
+  // 다른 탭/AI가 블록을 바꾸면 그 리비전까지 당겨 온다. 이미 반영한 리비전이면(이 탭의 저장 등) 건너뛴다.
+  useEffect(() => subscribeChanges((entities, revision) => {
+    if (!entities.includes("blocks")) return;
+    if (revisionRef.current != null && revision <= revisionRef.current) return;
+    pullRef.current().catch(() => {});
+  }), []);
   useEffect(() => {
     const id = setInterval(() => setNowTick(Date.now()), 1000);
     return () => clearInterval(id);
@@ -536,7 +623,7 @@ export default function Week() {
               end_at: override.end.toISOString(),
             }),
           });
-          await load();
+          await pull();
         } catch {
           // ignore
         }
@@ -620,9 +707,9 @@ export default function Week() {
     setModalOpen(true);
   };
 
-  const createBlock = async (payload) => { await api("/blocks", { method: "POST", body: JSON.stringify(payload) }); await load(); };
-  const updateBlock = async (payload) => { await api(`/blocks/${selected.id}`, { method: "PATCH", body: JSON.stringify(payload) }); await load(); };
-  const deleteBlock = async () => { await api(`/blocks/${selected.id}`, { method: "DELETE" }); await load(); };
+  const createBlock = async (payload) => { await api("/blocks", { method: "POST", body: JSON.stringify(payload) }); await pull(); };
+  const updateBlock = async (payload) => { await api(`/blocks/${selected.id}`, { method: "PATCH", body: JSON.stringify(payload) }); await pull(); };
+  const deleteBlock = async () => { await api(`/blocks/${selected.id}`, { method: "DELETE" }); await pull(); };
 
   const sendChat = async () => {
     const text = chatInput.trim();
@@ -651,7 +738,7 @@ export default function Week() {
         { id: `a-${Date.now()}`, role: "assistant", text: res?.reply || "응답을 가져오지 못했어요." },
       ]);
       if (res?.created_blocks && res.created_blocks.length > 0) {
-        await load();
+        await pull();
       }
     } catch (e) {
       setMessages((prev) => [